@@ -1,21 +1,167 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, request
 from flask_cors import CORS
+from cachetools import TTLCache
 import feedparser
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import io
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import re
+import xml.etree.ElementTree as ET
 
 app = Flask(__name__)
 CORS(app)
 
+logger = logging.getLogger(__name__)
+
 # Disable logging noise
 logging.getLogger("urllib3").setLevel(logging.CRITICAL)
 logging.getLogger("feedparser").setLevel(logging.CRITICAL)
 
+# Patterns used per RSS entry, compiled once at import
+_IMG_SRC_RE = re.compile(r'<img[^>]*?\ssrc=["\']([^"\']+)["\']')
+_SKIP_IMG_RE = re.compile(r'logo|favicon|1x1|spacer', re.I)
+
+# RSS fetches are network-bound, so topics are fetched concurrently
+_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Shared HTTP session so keep-alive reuses the TLS connection across fetches.
+# A browser-like User-Agent avoids remote blocks.
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) LegalAI/1.0"
+)
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=Retry(total=3, backoff_factor=0.3)),
+)
+
+# Serialized responses per topic: {topic: articles_json_bytes}. Topics come
+# from the URL, so the cache is size-bounded as well as expiring
+NEWS_CACHE_TTL_SECONDS = float(os.getenv("NEWS_CACHE_TTL_SECONDS", "300"))
+NEWS_CACHE_MAX_TOPICS = int(os.getenv("NEWS_CACHE_MAX_TOPICS", "256"))
+_cache = TTLCache(maxsize=NEWS_CACHE_MAX_TOPICS, ttl=NEWS_CACHE_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+# HTTP validators per feed URL: {rss_url: (etag, last_modified, articles)}.
+# Kept longer than responses so stale topics can still be revalidated with a 304
+NEWS_VALIDATOR_TTL_SECONDS = float(os.getenv("NEWS_VALIDATOR_TTL_SECONDS", "3600"))
+_validators = TTLCache(maxsize=NEWS_CACHE_MAX_TOPICS, ttl=NEWS_VALIDATOR_TTL_SECONDS)
+
+
+def _cache_get(topic: str):
+    """Return cached JSON bytes for a topic, or None if missing or expired."""
+    with _cache_lock:
+        return _cache.get(topic)
+
+
+def _cache_put(topic: str, body: bytes):
+    with _cache_lock:
+        _cache[topic] = body
+
+
+def _json_response(body, status=200):
+    """Build a JSON response with orjson; accepts an object or pre-serialized bytes."""
+    if not isinstance(body, bytes):
+        body = orjson.dumps(body)
+    return Response(body, status=status, mimetype='application/json')
 
 
+def _strip_tags(s: str) -> str:
+    """Remove HTML tags with a linear str.find scan (no regex backtracking)."""
+    out = []
+    i = 0
+    while True:
+        lt = s.find('<', i)
+        if lt < 0:
+            out.append(s[i:])
+            break
+        out.append(s[i:lt])
+        gt = s.find('>', lt)
+        if gt < 0:
+            break
+        i = gt + 1
+    return ''.join(out)
+
+
+_MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+_MAX_ITEMS = 10
+_IMG_KEYS = ('media_content', 'media_thumbnail')
+
+
+def _parse_rss2(body: bytes, limit: int = _MAX_ITEMS) -> list:
+    """
+    Stream-parses RSS 2.0 <item> elements, stopping after `limit` items.
+    Each entry is a dict using the same keys feedparser would produce.
+    """
+    entries = []
+    for _, elem in ET.iterparse(io.BytesIO(body), events=('end',)):
+        if elem.tag != 'item':
+            continue
+        source = elem.find('source')
+        entries.append({
+            'title': elem.findtext('title', ''),
+            'link': elem.findtext('link', ''),
+            'summary': elem.findtext('description', ''),
+            'published': elem.findtext('pubDate', 'Recently'),
+            'source': {'title': source.text} if source is not None and source.text else {},
+            'media_content': [m.attrib for m in elem.findall(_MEDIA_NS + 'content')],
+            'media_thumbnail': [m.attrib for m in elem.findall(_MEDIA_NS + 'thumbnail')],
+            'links': [
+                {'rel': 'enclosure', 'type': e.get('type', ''), 'href': e.get('url', '')}
+                for e in elem.findall('enclosure')
+            ],
+        })
+        elem.clear()
+        if len(entries) >= limit:
+            break
+    return entries
+
+
+def _parse_feed(body: bytes) -> list:
+    """
+    Dispatches on feed type: RSS 2.0 (what Google News serves) takes the
+    streaming fast path, anything else (Atom, RDF) falls back to feedparser.
+    RSS that ElementTree rejects (malformed, HTML entities) also goes to
+    feedparser, which is more forgiving.
+    """
+    if b'<rss' in body[:200]:
+        try:
+            return _parse_rss2(body)
+        except ET.ParseError as e:
+            logger.debug("Fast RSS parse failed (%s), falling back to feedparser", e)
+    return feedparser.parse(body).entries[:_MAX_ITEMS]
+
 
+def _find_img_src(summary: str) -> str:
+    """
+    Returns the src of the first <img> in the summary HTML. The common case
+    (a quoted src= attribute) is read with str.find; the regex only runs
+    when that quick scan fails. Only a standalone src= counts, so lazy-load
+    attributes such as data-src= are skipped.
+    """
+    i = summary.find('<img')
+    if i < 0:
+        return ''
+    end = summary.find('>', i)
+    if end < 0:
+        end = len(summary)
+    j = summary.find('src=', i, end)
+    while j >= 0 and not summary[j - 1].isspace():
+        j = summary.find('src=', j + 4, end)
+    if j >= 0 and summary[j + 4:j + 5] in ('"', "'"):
+        quote = summary[j + 4]
+        k = summary.find(quote, j + 5)
+        if k >= 0:
+            return summary[j + 5:k]
+    match = _IMG_SRC_RE.search(summary, i)
+    return match.group(1) if match else ''
 
 
 def extract_image_from_entry(entry):
@@ -24,53 +170,38 @@ def extract_image_from_entry(entry):
     Google News RSS includes images in media:content tags.
     """
     try:
-        # Debug: Print all available keys in entry
-        available_keys = list(entry.keys())
-        print(f"      📋 Entry keys: {available_keys}")
-        
-        # Check for media content (most reliable)
-        if hasattr(entry, 'media_content') and entry.media_content:
-            for media in entry.media_content:
-                if media.get('url'):
-                    print(f"      ✅ Found media_content image: {media.get('url')[:60]}")
-                    return media.get('url')
+        # Dump available keys only when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Entry keys: %s", list(entry.keys()))
         
-        # Check for media:thumbnail
-        if hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
-            for thumb in entry.media_thumbnail:
-                if thumb.get('url'):
-                    print(f"      ✅ Found media_thumbnail image: {thumb.get('url')[:60]}")
-                    return thumb.get('url')
-        
-        # Check for image link
-        if hasattr(entry, 'image') and entry.image:
-            if hasattr(entry.image, 'url'):
-                print(f"      ✅ Found image.url: {entry.image.url[:60]}")
-                return entry.image.url
-        
-        # Check for links with rel="image"
-        if hasattr(entry, 'links') and entry.links:
-            for link in entry.links:
-                if link.get('rel') == 'image' or link.get('type', '').startswith('image/'):
-                    print(f"      ✅ Found image link: {link.get('href', '')[:60]}")
-                    return link.get('href', '')
+        # Checked in priority order; media:content is the most reliable
+        for key in _IMG_KEYS:
+            for media in entry.get(key) or ():
+                url = media.get('url')
+                if url:
+                    logger.debug("Found %s image: %.60s", key, url)
+                    return url
+
+        url = next(
+            (link.get('href', '') for link in entry.get('links') or ()
+             if link.get('rel') == 'image' or (link.get('type') or '').startswith('image/')),
+            '',
+        )
+        if url:
+            logger.debug("Found image link: %.60s", url)
+            return url
         
         # Parse image from summary HTML (fallback)
-        summary = entry.get('summary', '')
-        if summary and '<img' in summary:
-            # Extract src from img tag
-            match = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', summary)
-            if match:
-                img_url = match.group(1)
-                if img_url and not any(x in img_url.lower() for x in ['logo', 'favicon', '1x1', 'spacer']):
-                    print(f"      ✅ Found image in summary HTML: {img_url[:60]}")
-                    return img_url
+        img_url = _find_img_src(entry.get('summary', ''))
+        if img_url and not _SKIP_IMG_RE.search(img_url):
+            logger.debug("Found image in summary HTML: %.60s", img_url)
+            return img_url
         
-        print(f"      ⚠️  No image found in entry")
+        logger.debug("No image found in entry")
         return ""
     
     except Exception as e:
-        print(f"      ❌ Error extracting image: {str(e)}")
+        logger.warning("Error extracting image: %s", e)
         return ""
 
 
@@ -79,96 +210,112 @@ def fetch_news_from_rss(topic: str):
     Fetches news from Google News RSS feed.
     RSS is faster, stable, and never blocked compared to HTML scraping.
     """
-    print(f"\n🔍 Fetching news from Google News RSS: '{topic}'")
+    logger.info("Fetching news from Google News RSS: '%s'", topic)
     
     # Google News RSS endpoint
     rss_url = f"https://news.google.com/rss/search?q={topic.replace(' ', '+')}"
     
     try:
-        print(f"   📡 URL: {rss_url}")
+        logger.debug("URL: %s", rss_url)
 
-        # Fetch the RSS using requests with a browser-like User-Agent to avoid remote blocks
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) LegalAI/1.0"
-        }
-        resp = requests.get(rss_url, headers=headers, timeout=10)
+        # Fetch the RSS over the pooled session, revalidating if we have seen it before
+        with _cache_lock:
+            validator = _validators.get(rss_url)
+        headers = {}
+        if validator:
+            etag, last_modified, _ = validator
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        resp = _SESSION.get(rss_url, headers=headers, timeout=10)
+        if resp.status_code == 304 and validator:
+            logger.debug("Feed not modified, reusing %d cached articles", len(validator[2]))
+            return validator[2]
         if resp.status_code != 200:
-            print(f"   ❌ RSS fetch failed: status={resp.status_code}")
+            logger.warning("RSS fetch failed: status=%s", resp.status_code)
             return []
 
-        # Parse the RSS content
-        feed = feedparser.parse(resp.content)
+        # Parse only the items we need
+        entries = _parse_feed(resp.content)
 
         # Check if feed parsed successfully
-        entries = getattr(feed, "entries", None)
         if not entries:
-            print(f"   ❌ Failed to parse feed or no entries found")
+            logger.warning("Failed to parse feed or no entries found")
             return []
 
-        print(f"   ✅ Feed parsed successfully, found {len(entries)} entries")
+        logger.debug("Feed parsed successfully, found %d entries", len(entries))
         
         articles = []
-        seen_titles = set()
+        seen_urls = set()
+        topic_lc = topic.lower()
+        id_prefix = topic_lc + '-'
         
-        for idx, entry in enumerate(entries[:10]):
+        for entry in entries[:_MAX_ITEMS]:
             try:
                 # Extract basic fields
                 title = entry.get('title', '').strip()
                 
-                # Skip empty or duplicate titles
-                if not title or title in seen_titles:
+                if not title:
                     continue
-                seen_titles.add(title)
                 
-                # Extract URL
+                # Extract URL, skipping duplicates (falls back to the title)
                 url = entry.get('link', '')
+                url_key = url or title
+                if url_key in seen_urls:
+                    continue
+                seen_urls.add(url_key)
                 
                 # Extract description/summary
                 description = entry.get('summary', '').strip()
                 # Remove HTML tags if present
                 if '<' in description and '>' in description:
                     # Remove all HTML tags properly
-                    description = re.sub(r'<[^>]+>', '', description).strip()
+                    description = _strip_tags(description).strip()
                 
                 # Extract published date
                 published_date = entry.get('published', 'Recently')
                 
                 # Extract source (from title sometimes contains source info)
-                source = entry.get('source', {}).get('title', 'Google News')
+                source = entry.get('source')
+                source = source.get('title', 'Google News') if source else 'Google News'
                 
                 # Extract thumbnail image directly from RSS entry
                 image = extract_image_from_entry(entry)
                 
                 article = {
-                    "id": f"{topic.lower()}-{len(articles)}",
+                    "id": id_prefix + str(len(articles)),
                     "title": title,
                     "description": description[:250] if description else title[:200],
                     "url": url,
                     "publishedDate": published_date,
                     "source": source,
                     "image": image,  # Images from RSS feed metadata
-                    "topic": topic.lower()
+                    "topic": topic_lc
                 }
                 
                 articles.append(article)
-                if image:
-                    print(f"   ✓ Article {len(articles)}: {title[:50]}... [📸 RSS Image]")
-                else:
-                    print(f"   ✓ Article {len(articles)}: {title[:50]}...")
+                logger.debug("Article %d: %.50s%s", len(articles), title, " [RSS image]" if image else "")
                 
             except Exception as e:
-                print(f"   ⚠️  Error parsing entry {idx}: {str(e)}")
+                logger.warning("Error parsing entry '%.30s': %s", entry.get('title', '?'), e)
                 continue
         
         if articles:
-            print(f"\n   🎉 SUCCESS! Found {len(articles)} articles for '{topic}'")
+            logger.info("Found %d articles for '%s'", len(articles), topic)
+            etag = resp.headers.get('ETag')
+            last_modified = resp.headers.get('Last-Modified')
+            if etag or last_modified:
+                with _cache_lock:
+                    _validators[rss_url] = (etag, last_modified, articles)
             return articles
         else:
-            print(f"   ⚠️  No valid articles extracted from feed")
+            logger.warning("No valid articles extracted from feed")
             return []
     
     except Exception as e:
-        print(f"   ❌ Error fetching RSS feed: {str(e)}")
+        logger.error("Error fetching RSS feed: %s", e)
         return []
 
 
@@ -182,32 +329,89 @@ def get_news(topic):
     """
     topic_clean = topic.lower().strip()
     
-    print(f"\n{'='*70}")
-    print(f"📨 NEWS REQUEST: {topic_clean}")
-    print(f"{'='*70}")
+    logger.info("News request: %s", topic_clean)
+
+    cached = _cache_get(topic_clean)
+    if cached is not None:
+        logger.info("Returning cached articles for '%s'", topic_clean)
+        return _json_response(cached)
     
-    # Fetch articles from RSS feed
+    # Fetch articles from RSS feed on this request thread; the pool is only
+    # for fanning out batch requests
     articles = fetch_news_from_rss(topic_clean)
     
     if not articles:
         error_msg = f"No news found for '{topic_clean}'"
-        print(f"\n❌ RETURNING ERROR")
-        return jsonify({"error": error_msg}), 404
+        logger.info("No news found for '%s'", topic_clean)
+        return _json_response({"error": error_msg}, 404)
     
-    print(f"\n✅ RETURNING {len(articles)} ARTICLES")
-    return jsonify(articles), 200
+    body = orjson.dumps(articles)
+    _cache_put(topic_clean, body)
+
+    logger.info("Returning %d articles for '%s'", len(articles), topic_clean)
+    return _json_response(body)
+
+
+@app.route('/news', methods=['GET'])
+def get_news_batch():
+    """
+    GET /news?topics=a,b,c
+    Fetches news for several topics concurrently and returns the merged list.
+
+    Returns JSON array of articles, 400 if no topics given, or 404 if none found.
+    """
+    topics = [t.lower().strip() for t in (request.args.get('topics') or '').split(',')]
+    topics = [t for t in dict.fromkeys(topics) if t]
+    if not topics:
+        return _json_response({"error": "Query parameter 'topics' is required"}, 400)
+
+    logger.info("News batch request: %s", ', '.join(topics))
+
+    # Serve each topic from the per-topic cache, fetching only the misses concurrently
+    bodies = {}
+    missing = []
+    for topic in topics:
+        body = _cache_get(topic)
+        if body is None:
+            missing.append(topic)
+        else:
+            bodies[topic] = body
+    for topic, topic_articles in zip(missing, _POOL.map(fetch_news_from_rss, missing)):
+        if topic_articles:
+            body = orjson.dumps(topic_articles)
+            _cache_put(topic, body)
+            bodies[topic] = body
+
+    if not bodies:
+        return _json_response({"error": f"No news found for '{', '.join(topics)}'"}, 404)
+
+    # Each cached body is a JSON array; splice their items into one array
+    # without deserializing
+    logger.info("Returning articles for %d of %d topics", len(bodies), len(topics))
+    return _json_response(b"[" + b",".join(bodies[t][1:-1] for t in topics if t in bodies) + b"]")
+
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({"status": "✅ Backend is running!", "port": 3000}), 200
+    return _json_response({"status": "✅ Backend is running!", "port": 3000})
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s %(message)s')
     print("\n" + "="*70)
     print("🚀 LEGALAI NEWS BACKEND - GOOGLE NEWS RSS FEED")
     print("="*70)
     print("📍 Server: http://localhost:3000")
     print("📰 Endpoint: GET /news/<topic>")
+    print("📰 Endpoint: GET /news?topics=a,b,c")
     ...
-    app.run(debug=False, port=3000, threaded=True)
+    # For multiple worker processes use gunicorn instead:
+    #   gunicorn -w $(nproc) -k gthread --threads 8 -b 0.0.0.0:3000 app:app
+    try:
+        from waitress import serve
+    except ImportError:
+        logger.warning("waitress not installed, falling back to the Flask development server")
+        app.run(debug=False, port=3000, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=3000, threads=16)
@@ -0,0 +1,18 @@
+from app import _find_img_src
+
+
+def test_find_img_src_plain():
+    assert _find_img_src('<p><img src="real.jpg" alt="x"></p>') == 'real.jpg'
+
+
+def test_find_img_src_skips_data_src():
+    assert _find_img_src('<img data-src="lazy.gif" src="real.jpg">') == 'real.jpg'
+    assert _find_img_src('<img src="real.jpg" data-src="lazy.gif">') == 'real.jpg'
+
+
+def test_find_img_src_only_data_src():
+    assert _find_img_src('<img data-src="lazy.gif">') == ''
+
+
+def test_find_img_src_unquoted_falls_back_to_empty():
+    assert _find_img_src('<img src=real.jpg>') == ''
@@ -1,13 +1,25 @@
 import streamlit as st
 from document_loader import load_document
 from chunking import chunk_text
-from embedding_store import build_faiss_index
-from rag_pipeline import rag_query
-from llm_interface import query_llm
 
 st.set_page_config(page_title="AI Contract Assistant", layout="wide")
 st.title("📄 AI Contract & Policy Assistant")
 
+
+@st.cache_resource
+def _get_embedder():
+    # Loads FAISS + the sentence-transformer once, on first upload
+    from embedding_store import build_faiss_index
+    return build_faiss_index
+
+
+@st.cache_resource
+def _get_llm():
+    # Configures the Gemini client once, on first upload
+    from llm_interface import query_llm, query_llm_stream
+    return query_llm, query_llm_stream
+
+
 # Session state to keep index and chunks for multiple queries
 if "index" not in st.session_state:
     st.session_state.index = None
@@ -20,6 +32,10 @@ if "file_text" not in st.session_state:
 uploaded_file = st.file_uploader("Upload a contract (PDF/DOCX/TXT)", type=["pdf", "docx", "txt"])
 
 if uploaded_file:
+    build_faiss_index = _get_embedder()
+    query_llm, query_llm_stream = _get_llm()
+    from rag_pipeline import rag_query
+
     with st.spinner("Processing document..."):
         # Save temporarily
         file_path = f"temp_{uploaded_file.name}"
@@ -59,11 +75,17 @@ if uploaded_file:
 
     # 5️⃣ Optional: Summarize document
     if st.button("Summarize Document"):
-        with st.spinner("Generating summary..."):
-            summary_prompt = f"Summarize the following contract concisely:\n\n{st.session_state.file_text}"
-            summary = query_llm(summary_prompt)
+        summary_prompt = f"Summarize the following contract concisely:\n\n{st.session_state.file_text}"
         st.subheader("Document Summary:")
-        st.write(summary)
+        # Render tokens as they stream in instead of waiting for the full summary
+        placeholder = st.empty()
+        buf = []
+        try:
+            for chunk in query_llm_stream(summary_prompt):
+                buf.append(chunk.text)
+                placeholder.write("".join(buf))
+        except Exception as e:
+            placeholder.write(f"Error querying Gemini: {e}")
 
     # 6️⃣ Optional: Compare clause to template
     if st.button("Compare Clause to Standard Template"):
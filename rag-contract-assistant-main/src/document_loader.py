@@ -43,16 +43,26 @@
 import os
 import pdfplumber
 import docx
+from pdfminer.high_level import extract_text
+from pdfminer.layout import LAParams
 
 def load_pdf(file_path: str) -> str:
-    """Extract text from a PDF file."""
-    text = ""
+    """Extract text from a PDF file.
+
+    Uses pdfminer directly (skipping pdfplumber's table/shape analysis) and
+    falls back to pdfplumber if that yields no text.
+    """
+    text = extract_text(file_path, laparams=LAParams(detect_vertical=False, line_margin=0.5)).strip()
+    if text:
+        return text
+
+    parts = []
     with pdfplumber.open(file_path) as pdf:
         for page in pdf.pages:
             page_text = page.extract_text()
             if page_text:
-                text += page_text + "\n"
-    return text.strip()
+                parts.append(page_text)
+    return "\n".join(parts).strip()
 
 def load_docx(file_path: str) -> str:
     """Extract text from a DOCX file."""
@@ -61,8 +71,8 @@ def load_docx(file_path: str) -> str:
     return text.strip()
 
 def load_txt(file_path: str) -> str:
-    """Extract text from a TXT file."""
-    with open(file_path, "r", encoding="utf-8") as f:
+    """Extract text from a TXT file, replacing undecodable bytes."""
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
         text = f.read()
     return text.strip()
 
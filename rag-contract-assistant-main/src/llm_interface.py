@@ -1,5 +1,9 @@
 
 
+import hashlib
+import os
+import time
+
 import google.generativeai as genai
 
 # 🔑 Hardcoded API key (for testing purposes only)
@@ -12,14 +16,69 @@ genai.configure(api_key=API_KEY)
 MODEL_NAME = "gemini-1.5-flash"
 model = genai.GenerativeModel(MODEL_NAME)
 
+# Responses are also cached on disk so they survive Streamlit restarts.
+# They are derived from contract text, so entries expire and the directory is capped
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "rag-contract")
+CACHE_TTL_SECONDS = 24 * 3600
+CACHE_MAX_ENTRIES = 512
+
+def _cache_path(prompt: str) -> str:
+    return os.path.join(CACHE_DIR, hashlib.sha1(prompt.encode("utf-8")).hexdigest() + ".txt")
+
+def _read_cache(prompt: str):
+    path = _cache_path(prompt)
+    try:
+        if time.time() - os.path.getmtime(path) > CACHE_TTL_SECONDS:
+            os.remove(path)
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _prune_cache():
+    """Drop expired entries, then the oldest ones beyond CACHE_MAX_ENTRIES."""
+    entries = sorted(
+        (e for e in os.scandir(CACHE_DIR) if e.name.endswith(".txt")),
+        key=lambda e: e.stat().st_mtime,
+        reverse=True,
+    )
+    cutoff = time.time() - CACHE_TTL_SECONDS
+    for i, e in enumerate(entries):
+        if i >= CACHE_MAX_ENTRIES or e.stat().st_mtime < cutoff:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+def _write_cache(prompt: str, text: str):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(_cache_path(prompt), "w", encoding="utf-8") as f:
+            f.write(text)
+        _prune_cache()
+    except OSError:
+        pass
+def _generate(prompt: str) -> str:
+    # Exceptions propagate, so failed calls are never cached. The small disk
+    # read is the only cache layer, so CACHE_TTL_SECONDS holds on every hit
+    text = _read_cache(prompt)
+    if text is None:
+        text = model.generate_content(prompt).text
+        _write_cache(prompt, text)
+    return text
+
 def query_llm(prompt: str) -> str:
     """
     Send a prompt to Gemini and return the response text.
     """
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        return _generate(prompt)
     except Exception as e:
         return f"Error querying Gemini: {e}"
 
-
+def query_llm_stream(prompt: str):
+    """
+    Send a prompt to Gemini and return an iterator of partial responses as they arrive.
+    """
+    return model.generate_content(prompt, stream=True)
@@ -1,6 +1,6 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Request, status
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from contextlib import asynccontextmanager
@@ -9,21 +9,41 @@ import logging
 import logging.handlers
 import traceback
 import sys
+import threading
 import time
 import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-import feedparser
 import re
-
-from document_loader import load_document_with_meta
+import xml.etree.ElementTree as ET
+import json
+import httpx
+import orjson
+from cachetools import TTLCache
+from pydantic import BaseModel
+
+from document_loader import load_document_with_meta, warm_up as warm_up_document_loader
 from chunking import chunk_text
-from embedding_store import build_faiss_index, search as embed_search
-from rag_pipeline import rag_query
-from llm_interface import query_llm
+from embedding_store import (
+    INDEX_FORMAT,
+    asearch,
+    build_faiss_index,
+    embedding_batcher,
+    get_model,
+    set_faiss_threads,
+    to_cpu,
+    to_device,
+)
+from rag_pipeline import arag_query
+from llm_interface import aquery_llm, invalidate_answer, invalidate_session as invalidate_llm_cache
+import index_cache
 
 from config import settings
 from session_manager import SessionManager, SessionNotFoundError
 from models import (
+    AnalysisType,
     QueryRequest,
     SummarizeRequest,
     ExtractClausesRequest,
@@ -41,6 +61,7 @@ from models import (
     HealthCheckResponse,
 )
 from utils import (
+    FileTooLargeError,
     save_upload_file_temp,
     cleanup_temp_file,
     validate_upload_file,  # Changed from validate_file_type
@@ -49,9 +70,25 @@ from utils import (
     create_error_response,
     create_success_response,
     setup_logger,
+    stop_log_listeners,
     generate_request_id,
 )
 
+# Prefer the libuv-based event loop when it is installed (ships with uvicorn[standard])
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Optional repair of malformed LLM JSON output
+try:
+    import json_repair
+    JSON_REPAIR_ENABLED = True
+except Exception:
+    json_repair = None  # type: ignore
+    JSON_REPAIR_ENABLED = False
+
 # Configure logging
 if not os.path.exists('logs'):
     os.makedirs('logs')
@@ -60,7 +97,7 @@ logger = setup_logger(__name__, log_level=settings.LOG_LEVEL, log_file=settings.
 logger.info(f"Initializing FastAPI backend (v0.1.0) with DEBUG={settings.DEBUG}")
 
 # Global state
-sessions = SessionManager()
+sessions = SessionManager(on_delete=invalidate_llm_cache, max_age_hours=settings.SESSION_MAX_AGE_HOURS)
 app_start_time = None
 
 
@@ -72,6 +109,9 @@ async def cleanup_sessions_task():
             await asyncio.sleep(settings.SESSION_CLEANUP_INTERVAL_MINUTES * 60)
             count = sessions.cleanup_expired_sessions(settings.SESSION_MAX_AGE_HOURS)
             logger.info(f"Background cleanup: removed {count} expired sessions")
+            evicted = index_cache.evict_lru(settings.INDEX_CACHE_DIR, settings.INDEX_CACHE_MAX_ENTRIES)
+            if evicted:
+                logger.info(f"Background cleanup: evicted {evicted} index cache entries")
         except Exception as e:
             logger.exception("Error in cleanup task")
 
@@ -90,6 +130,33 @@ async def lifespan(app: FastAPI):
     if not os.getenv("GEMINI_API_KEY"):
         logger.warning("GEMINI_API_KEY environment variable not set - LLM queries will fail")
     
+    # Worker pools: processes for GIL-bound extraction, threads for blocking I/O
+    # and GIL-releasing native work (embeddings, FAISS). Under several server
+    # workers (WEB_CONCURRENCY) the cores are split between their pools
+    web_workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    cpu_workers = settings.CPU_POOL_WORKERS or max(1, (os.cpu_count() or 1) // web_workers)
+    app.state.cpu_pool = ProcessPoolExecutor(
+        max_workers=cpu_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_up_document_loader,
+    )
+    # Start every worker now so parser imports and OCR warm-up happen before the first upload
+    for _ in range(cpu_workers):
+        app.state.cpu_pool.submit(os.getpid)
+    app.state.io_pool = ThreadPoolExecutor(thread_name_prefix="io")
+    # Shared keep-alive client for outbound HTTP (news proxy)
+    app.state.http_client = httpx.AsyncClient(
+        timeout=5.0,
+        follow_redirects=True,
+        headers={"User-Agent": "Mozilla/5.0 (compatible; LegalAI/1.0)"},
+    )
+    
+    # Applied here rather than at import so values from .env are honoured
+    set_faiss_threads(settings.FAISS_OMP_THREADS)
+
+    # Load the embedding model before serving (a no-op when main.py already did)
+    await asyncio.get_running_loop().run_in_executor(app.state.io_pool, get_model)
+    
     # Start background cleanup task
     cleanup_task = asyncio.create_task(cleanup_sessions_task())
     logger.info(f"Session cleanup task started (interval: {settings.SESSION_CLEANUP_INTERVAL_MINUTES} minutes)")
@@ -103,46 +170,52 @@ async def lifespan(app: FastAPI):
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    app.state.cpu_pool.shutdown(wait=False, cancel_futures=True)
+    app.state.io_pool.shutdown(wait=False, cancel_futures=True)
+    await app.state.http_client.aclose()
+    await embedding_batcher.close()
     # Final cleanup
     final_count = sessions.cleanup_expired_sessions(0)  # cleanup all
     logger.info(f"Final cleanup: removed {final_count} sessions on shutdown")
+    # Last, once pools and tasks are down: flush queued records and log directly from here on
+    stop_log_listeners()
 
 
 # Exception handlers
-async def session_not_found_handler(request: Request, exc: SessionNotFoundError) -> JSONResponse:
+async def session_not_found_handler(request: Request, exc: SessionNotFoundError) -> ORJSONResponse:
     """Handle session not found errors."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_404_NOT_FOUND,
         content=ErrorResponse(
             error="Session not found",
             detail=str(exc),
             success=False,
-        ).dict(),
+        ).model_dump(),
     )
 
 
-async def validation_error_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_error_handler(request: Request, exc: RequestValidationError) -> ORJSONResponse:
     """Handle validation errors with detailed feedback."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content=ErrorResponse(
             error="Validation error",
             detail=str(exc.errors()),
             success=False,
-        ).dict(),
+        ).model_dump(),
     )
 
 
-async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def generic_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handle uncaught exceptions."""
     logger.exception(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ErrorResponse(
             error="Internal server error",
             detail="An unexpected error occurred" if not settings.DEBUG else str(exc),
             success=False,
-        ).dict(),
+        ).model_dump(),
     )
 
 
@@ -158,6 +231,7 @@ app = FastAPI(
     docs_url="/api/docs" if settings.ENABLE_API_DOCS else None,
     redoc_url="/api/redoc" if settings.ENABLE_API_DOCS else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -176,22 +250,23 @@ async def logging_middleware(request: Request, call_next):
     request_id = generate_request_id()
     start = time.time()
     
-    # Log request
+    # Log request (%-style so nothing is formatted unless INFO is enabled)
     logger.info(
-        f"[{request_id}] {request.method} {request.url.path} - "
-        f"client={request.client.host if request.client else 'unknown'}"
+        "[%s] %s %s - client=%s",
+        request_id,
+        request.method,
+        request.url.path,
+        request.client.host if request.client else "unknown",
     )
     
     try:
         response = await call_next(request)
     except Exception as e:
-        logger.error(f"[{request_id}] Request processing error: {e}")
+        logger.error("[%s] Request processing error: %s", request_id, e)
         raise
     
     duration = time.time() - start
-    logger.info(
-        f"[{request_id}] Response: {response.status_code} ({duration:.3f}s)"
-    )
+    logger.info("[%s] Response: %s (%.3fs)", request_id, response.status_code, duration)
     
     return response
 
@@ -202,6 +277,112 @@ app.add_exception_handler(RequestValidationError, validation_error_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
 
+async def run_in_cpu_pool(func, *args, **kwargs):
+    """Run CPU-bound work in the process pool, off the event loop and the GIL."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.cpu_pool, functools.partial(func, *args, **kwargs))
+
+
+async def run_in_io_pool(func, *args, **kwargs):
+    """Run blocking I/O or GIL-releasing work in the thread pool, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.io_pool, functools.partial(func, *args, **kwargs))
+
+
+def json_model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """Serialize a response model straight to JSON.
+
+    Skips FastAPI's re-validation and jsonable_encoder pass over large
+    payloads; the endpoint's response_model still documents the schema.
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+# Prompt templates; each session keeps one clamped copy of the document text,
+# joined with these per request
+SUMMARIZE_PROMPT = "Summarize the following contract concisely:\n\n"
+ANALYZE_PROMPT_PREFIX = "Analyze the following contract for potential "
+ANALYZE_PROMPT_SUFFIX = " issues, liabilities, and areas of concern:\n\n"
+EXTRACT_CLAUSES_PROMPT = """Analyze this legal document and extract ALL clauses. For each clause, provide:
+1. The full clause text
+2. Clause type/category (e.g., "Data Use - Payment & Delivery", "Liability Limitation", "Termination")
+3. Risk level (must be one of: safe, moderate, high)
+4. Brief implications (2-3 sentences explaining the impact)
+5. General category if applicable (e.g., Data Use, Liability, Payment, Legal, Termination)
+
+Format EVERY response as a valid JSON array with objects having these exact fields:
+- clause_text (string): full clause text
+- clause_type (string): specific type/description
+- risk_level (string): one of safe/moderate/high
+- implications (string): brief explanation
+- category (string or null): general category
+
+RESPOND ONLY WITH THE JSON ARRAY. No additional text.
+
+Document text:
+"""
+
+
+# Markdown code fences around LLM JSON output
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.MULTILINE)
+_json_decoder = json.JSONDecoder()
+
+
+def _salvage_json_array(text: str) -> list:
+    """Decode the complete leading items of a possibly truncated JSON array."""
+    items = []
+    pos = text.find('[')
+    if pos < 0:
+        return items
+    pos += 1
+    end = len(text)
+    while pos < end:
+        while pos < end and text[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= end or text[pos] == ']':
+            break
+        try:
+            item, pos = _json_decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            break
+        items.append(item)
+    return items
+
+
+def parse_clauses_json(llm_response: str) -> list:
+    """Parse the clause-extraction LLM output into a list of dicts.
+
+    Tries a strict parse first, then json_repair when installed, then
+    decodes whatever complete array items precede a truncated tail.
+    """
+    cleaned = _FENCE_RE.sub('', llm_response)
+    try:
+        parsed = orjson.loads(cleaned)
+    except orjson.JSONDecodeError:
+        parsed = None
+        if JSON_REPAIR_ENABLED:
+            try:
+                parsed = orjson.loads(json_repair.repair_json(cleaned))
+            except Exception:
+                parsed = None
+        if parsed is None:
+            parsed = _salvage_json_array(cleaned)
+    if isinstance(parsed, dict):
+        return [parsed]
+    if not isinstance(parsed, list):
+        return []
+    return [item for item in parsed if isinstance(item, dict)]
+
+
+def clamp_context(text: str) -> str:
+    """Clamp document text to LLM_MAX_CONTEXT_CHARS for use in LLM prompts."""
+    return text[: settings.LLM_MAX_CONTEXT_CHARS]
+
+
 @app.post(
     f"{settings.API_PREFIX}/upload",
     response_model=UploadResponse,
@@ -209,56 +390,81 @@ app.add_exception_handler(Exception, generic_exception_handler)
     summary="Upload and process a document",
     description="Upload a PDF, DOCX, TXT, or image file for processing and indexing. Returns a session_id for subsequent queries.",
 )
-def upload_file(file: UploadFile = File(...)):
+async def upload_file(file: UploadFile = File(...)):
     # Comprehensive file validation using validate_upload_file
     is_valid, error_msg = validate_upload_file(
         file, 
         settings.MAX_FILE_SIZE_MB, 
-        settings.ALLOWED_FILE_TYPES
+        settings.ALLOWED_FILE_TYPES_SET
     )
     if not is_valid:
         raise HTTPException(status_code=400, detail=error_msg)
 
     # Save temp file
-    temp_path = save_upload_file_temp(file)
+    try:
+        temp_path = await save_upload_file_temp(file, max_size_mb=settings.MAX_FILE_SIZE_MB)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
         # Additional validation: file size and content
         if not validate_file_size(temp_path, settings.MAX_FILE_SIZE_MB):
             cleanup_temp_file(temp_path)
             raise HTTPException(status_code=400, detail=f"File too large. Max {settings.MAX_FILE_SIZE_MB} MB allowed")
         
-        # Validate file content (check for corruption)
-        content_valid, content_error = validate_file_content(temp_path)
+        # Validate file content (check for corruption). The same pass hashes the
+        # content with the chunking settings, giving the index cache key
+        content_valid, content_error, cache_key = await run_in_io_pool(
+            validate_file_content,
+            temp_path,
+            salt=f"{settings.CHUNK_SIZE}:{settings.CHUNK_OVERLAP}:{INDEX_FORMAT}",
+            verify_images_with_pil=settings.VERIFY_IMAGES_WITH_PIL,
+        )
         if not content_valid:
             cleanup_temp_file(temp_path)
             raise HTTPException(status_code=400, detail=content_error)
 
-        # Extract text and metadata
-        try:
-            meta = load_document_with_meta(temp_path)
-            text = meta.get("text", "")
-            pages = meta.get("pages", 0)
-            file_type = meta.get("file_type", None)
-        except Exception as e:
-            logger.exception("Document extraction failed")
-            raise HTTPException(status_code=500, detail=f"Document extraction failed: {e}")
+        # Reuse a previously built index for identical content and chunking settings
+        cached = await run_in_io_pool(index_cache.load_cached, settings.INDEX_CACHE_DIR, cache_key)
+        if cached:
+            logger.info(f"Index cache hit for {file.filename} ({cache_key})")
+            text = cached["text"]
+            pages = cached["pages"]
+            file_type = cached["file_type"]
+            chunks = cached["chunks"]
+            index = await run_in_io_pool(to_device, cached["index"])
+            chunk_map = tuple(chunks)
+        else:
+            # Extract text and metadata
+            try:
+                meta = await run_in_cpu_pool(load_document_with_meta, temp_path)
+                text = meta.get("text", "")
+                pages = meta.get("pages", 0)
+                file_type = meta.get("file_type", None)
+            except Exception as e:
+                logger.exception("Document extraction failed")
+                raise HTTPException(status_code=500, detail=f"Document extraction failed: {e}")
 
-        # Validate that text was extracted
-        if not text or len(text.strip()) == 0:
-            raise HTTPException(status_code=400, detail="No text could be extracted from the document. Please ensure the file contains readable text.")
+            # Validate that text was extracted
+            if not text or len(text.strip()) == 0:
+                raise HTTPException(status_code=400, detail="No text could be extracted from the document. Please ensure the file contains readable text.")
 
-        # Chunk
-        chunks = chunk_text(text, max_length=settings.CHUNK_SIZE, overlap=settings.CHUNK_OVERLAP)
-        
-        # Validate that chunks were created
-        if not chunks:
-            raise HTTPException(status_code=400, detail="Failed to create text chunks from document. Document may be too short or corrupted.")
+            # Chunk
+            chunks = await run_in_io_pool(chunk_text, text, max_length=settings.CHUNK_SIZE, overlap=settings.CHUNK_OVERLAP)
+            
+            # Validate that chunks were created
+            if not chunks:
+                raise HTTPException(status_code=400, detail="Failed to create text chunks from document. Document may be too short or corrupted.")
 
-        # Build index
-        index, chunk_map = build_faiss_index(chunks)
+            # Build index
+            index, chunk_map = await run_in_io_pool(build_faiss_index, chunks)
+
+            cpu_index = await run_in_io_pool(to_cpu, index)
+            await run_in_io_pool(
+                index_cache.save_cached, settings.INDEX_CACHE_DIR, cache_key, cpu_index, chunks, text, pages, file_type
+            )
 
         # Store in session manager
-        session_id = sessions.create_session(index, chunk_map, text, file.filename)
+        session_id = sessions.create_session(index, chunk_map, file.filename, context=clamp_context(text))
 
         return UploadResponse(
             session_id=session_id,
@@ -285,20 +491,29 @@ def upload_file(file: UploadFile = File(...)):
     summary="Query a document",
     description="Ask questions about a previously uploaded document. Returns answer and relevant retrieved chunks.",
 )
-def query_document(req: QueryRequest):
+async def query_document(req: QueryRequest):
     try:
         session = sessions.get_session(req.session_id)
     except SessionNotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
 
     try:
-        answer = rag_query(req.query, session["index"], session["chunk_map"], top_k=settings.TOP_K_RESULTS)
+        # Embed the query once (batched with concurrent requests) and share it
+        # between answer generation and retrieval
+        query_vec = await embedding_batcher.embed(req.query)
+
+        answer = await arag_query(
+            req.query, session["index"], session["chunk_map"], top_k=settings.TOP_K_RESULTS, query_vec=query_vec,
+            session_id=req.session_id,
+        )
 
         # Also return retrieved chunks for transparency
-        results = embed_search(req.query, session["index"], session["chunk_map"], top_k=settings.TOP_K_RESULTS)
+        results = await asearch(
+            req.query, session["index"], session["chunk_map"], top_k=settings.TOP_K_RESULTS, query_vec=query_vec
+        )
         retrieved = [RetrievedChunk(text=chunk, distance=dist) for chunk, dist in results]
 
-        return QueryResponse(answer=answer, retrieved_chunks=retrieved)
+        return json_model_response(QueryResponse(answer=answer, retrieved_chunks=retrieved))
     except Exception as e:
         logger.exception("Query failed")
         raise HTTPException(status_code=500, detail=str(e))
@@ -311,15 +526,15 @@ def query_document(req: QueryRequest):
     summary="Summarize a document",
     description="Generate a concise summary of the uploaded document.",
 )
-def summarize(req: SummarizeRequest):
+async def summarize(req: SummarizeRequest):
     try:
         session = sessions.get_session(req.session_id)
     except SessionNotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
 
     try:
-        prompt = f"Summarize the following contract concisely:\n\n{session['file_text']}"
-        summary = query_llm(prompt)
+        prompt = SUMMARIZE_PROMPT + session["context"]
+        summary = await aquery_llm(prompt, session_id=req.session_id)
         return SummarizeResponse(summary=summary)
     except Exception as e:
         logger.exception("Summarization failed")
@@ -333,7 +548,7 @@ def summarize(req: SummarizeRequest):
     summary="Compare clause to template",
     description="Compare a specific clause from the document against standard templates and highlight differences.",
 )
-def compare(req: CompareRequest):
+async def compare(req: CompareRequest):
     try:
         session = sessions.get_session(req.session_id)
     except SessionNotFoundError:
@@ -346,7 +561,7 @@ Compare the following contract clause to a standard employment clause template a
 Clause:
 {req.clause}
 """
-        comparison = query_llm(comparison_prompt)
+        comparison = await aquery_llm(comparison_prompt, session_id=req.session_id)
         return CompareResponse(comparison=comparison)
     except Exception as e:
         logger.exception("Comparison failed")
@@ -360,16 +575,17 @@ Clause:
     summary="Analyze document for risks",
     description="Perform risk, compliance, or legal analysis on the uploaded document.",
 )
-def analyze(req: AnalyzeRequest):
+async def analyze(req: AnalyzeRequest):
     try:
         session = sessions.get_session(req.session_id)
     except SessionNotFoundError:
         raise HTTPException(status_code=404, detail="Session not found")
 
     try:
-        prompt = f"Analyze the following contract for potential {req.analysis_type} issues, liabilities, and areas of concern:\n\n{session['file_text']}"
-        analysis = query_llm(prompt)
-        return AnalyzeResponse(analysis=analysis, analysis_type=req.analysis_type)
+        analysis_type = AnalysisType(req.analysis_type or AnalysisType.risk).value
+        prompt = "".join((ANALYZE_PROMPT_PREFIX, analysis_type, ANALYZE_PROMPT_SUFFIX, session["context"]))
+        analysis = await aquery_llm(prompt, session_id=req.session_id)
+        return AnalyzeResponse(analysis=analysis, analysis_type=analysis_type)
     except Exception as e:
         logger.exception("Analysis failed")
         raise HTTPException(status_code=500, detail=str(e))
@@ -382,7 +598,7 @@ def analyze(req: AnalyzeRequest):
     summary="Extract and structure clauses from document",
     description="Extract all clauses from the document and return them as structured JSON with type, risk level, and implications.",
 )
-def extract_clauses(req: ExtractClausesRequest):
+async def extract_clauses(req: ExtractClausesRequest):
     """Extract structured clauses from a document."""
     try:
         session = sessions.get_session(req.session_id)
@@ -390,46 +606,19 @@ def extract_clauses(req: ExtractClausesRequest):
         raise HTTPException(status_code=404, detail="Session not found")
 
     try:
-        # Use a detailed prompt to get structured clause extraction
-        prompt = f"""Analyze this legal document and extract ALL clauses. For each clause, provide:
-1. The full clause text
-2. Clause type/category (e.g., "Data Use - Payment & Delivery", "Liability Limitation", "Termination")
-3. Risk level (must be one of: safe, moderate, high)
-4. Brief implications (2-3 sentences explaining the impact)
-5. General category if applicable (e.g., Data Use, Liability, Payment, Legal, Termination)
+        # Serve repeat requests from the clauses cached on the session
+        cached = session.get("clauses")
+        if cached is not None:
+            return json_model_response(ExtractClausesResponse(clauses=cached, total_clauses=len(cached)))
 
-Format EVERY response as a valid JSON array with objects having these exact fields:
-- clause_text (string): full clause text
-- clause_type (string): specific type/description
-- risk_level (string): one of safe/moderate/high
-- implications (string): brief explanation
-- category (string or null): general category
-
-RESPOND ONLY WITH THE JSON ARRAY. No additional text.
-
-Document text:
-{session['file_text']}
-"""
-        llm_response = query_llm(prompt)
+        # Use a detailed prompt to get structured clause extraction
+        prompt = "".join((EXTRACT_CLAUSES_PROMPT, session["context"], "\n"))
+        llm_response = await aquery_llm(prompt, session_id=req.session_id)
         
-        # Try to parse the LLM response as JSON
-        import json
-        try:
-            # Clean up the response if it contains markdown code blocks
-            cleaned = llm_response.strip()
-            if cleaned.startswith('```'):
-                # Remove markdown code block markers
-                cleaned = cleaned.split('```')[1]
-                if cleaned.startswith('json'):
-                    cleaned = cleaned[4:]
-                cleaned = cleaned.strip()
-            
-            parsed_clauses = json.loads(cleaned)
-            if not isinstance(parsed_clauses, list):
-                parsed_clauses = [parsed_clauses] if isinstance(parsed_clauses, dict) else []
-        except json.JSONDecodeError:
+        # Parse the LLM response as JSON, salvaging complete items from truncated output
+        parsed_clauses = parse_clauses_json(llm_response)
+        if not parsed_clauses:
             logger.warning("Failed to parse LLM response as JSON, returning empty clauses list")
-            parsed_clauses = []
         
         # Convert parsed data to ExtractedClause objects with validation
         extracted_clauses = []
@@ -447,72 +636,115 @@ Document text:
                 logger.warning(f"Failed to parse clause item: {e}")
                 continue
         
-        return ExtractClausesResponse(
+        if extracted_clauses:
+            sessions.update_session(req.session_id, clauses=extracted_clauses)
+        else:
+            # Let a retry ask the LLM again instead of replaying the unusable answer
+            invalidate_answer(prompt, session_id=req.session_id)
+
+        return json_model_response(ExtractClausesResponse(
             clauses=extracted_clauses,
             total_clauses=len(extracted_clauses),
-        )
+        ))
     except Exception as e:
         logger.exception("Clause extraction failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def fetch_news_from_rss(topic: str):
-    """Fetch a small set of articles from Google News RSS for a topic.
+# News proxy: tag stripper compiled once, results cached briefly per feed URL
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# rss_url -> articles; the URL embeds the user-supplied topic, so entries are bounded
+_news_cache = TTLCache(maxsize=settings.NEWS_CACHE_MAX_ENTRIES, ttl=settings.NEWS_CACHE_TTL_SECONDS)
+_news_cache_lock = threading.Lock()
+
+
+_MEDIA_NS = "{http://search.yahoo.com/mrss/}"
+
+
+def _parse_news_rss(content: bytes, topic: str) -> list:
+    """Parse up to 10 articles from a Google News RSS body; run off the event loop.
 
     Returns a list of simple dicts with keys: id,title,description,url,publishedDate,source,image,topic
     """
+    root = ET.fromstring(content)
+
+    articles = []
+    seen = set()
+    topic_lower = topic.lower()
+    for item in root.iterfind('./channel/item'):
+        if len(articles) >= 10:
+            break
+        try:
+            title = (item.findtext('title') or '').strip()
+            if not title:
+                continue
+
+            url = item.findtext('link', '')
+            url_key = url or title
+            if url_key in seen:
+                continue
+            seen.add(url_key)
+            description = item.findtext('description', '')
+            if '<' in description and '>' in description:
+                description = _HTML_TAG_RE.sub('', description).strip()
+
+            published = item.findtext('pubDate', '')
+            source_el = item.find('source')
+            source = (source_el.text or '') if source_el is not None else 'Google News'
+
+            # Attempt to extract image from common RSS fields
+            thumb = item.find(_MEDIA_NS + 'thumbnail')
+            image = thumb.get('url', '') if thumb is not None else ''
+            if not image:
+                image = next(
+                    (enc.get('url', '') for enc in item.iterfind('enclosure')
+                     if (enc.get('type') or '').startswith('image/')),
+                    '',
+                )
+
+            articles.append({
+                'id': f"{topic_lower}-{len(articles)}",
+                'title': title,
+                'description': (description or title)[:250],
+                'url': url,
+                'publishedDate': published,
+                'source': source,
+                'image': image,
+                'topic': topic_lower,
+            })
+        except Exception:
+            logger.exception("Error parsing RSS entry")
+            continue
+    return articles
+
+
+async def fetch_news_from_rss(client: httpx.AsyncClient, topic: str):
+    """Fetch a small set of articles from Google News RSS for a topic.
+
+    Results are cached for NEWS_CACHE_TTL_SECONDS per feed URL. A malformed
+    feed yields an empty list rather than an error.
+    """
     try:
         rss_url = f"https://news.google.com/rss/search?q={topic.replace(' ', '+')}&hl=en-US&gl=US&ceid=US:en"
+        with _news_cache_lock:
+            cached = _news_cache.get(rss_url)
+        if cached is not None:
+            return cached
+
         logger.info(f"Fetching news RSS: {rss_url}")
-        feed = feedparser.parse(rss_url)
-        if not feed or 'entries' not in feed:
-            logger.warning("Failed to parse news RSS feed")
+        resp = await client.get(rss_url)
+        if resp.status_code != 200:
+            logger.warning(f"News RSS fetch failed: status={resp.status_code}")
+            return []
+        try:
+            articles = await asyncio.to_thread(_parse_news_rss, resp.content, topic)
+        except ET.ParseError as e:
+            logger.warning(f"Malformed news RSS for '{topic}': {e}")
             return []
 
-        articles = []
-        seen = set()
-        for idx, entry in enumerate(feed.entries[:10]):
-            try:
-                title = (entry.get('title') or '').strip()
-                if not title or title in seen:
-                    continue
-                seen.add(title)
-
-                url = entry.get('link', '')
-                description = entry.get('summary', '')
-                if '<' in description and '>' in description:
-                    description = re.sub(r'<[^>]+>', '', description).strip()
-
-                published = entry.get('published', '')
-                source = entry.get('source', {}).get('title', '') if entry.get('source') else 'Google News'
-
-                # Attempt to extract image from common RSS fields
-                image = ''
-                if hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
-                    try:
-                        image = entry.media_thumbnail[0].get('url', '')
-                    except Exception:
-                        image = ''
-                if not image and hasattr(entry, 'links') and entry.links:
-                    for l in entry.links:
-                        if l.get('rel') == 'image' or (l.get('type') or '').startswith('image/'):
-                            image = l.get('href', '')
-                            break
-
-                articles.append({
-                    'id': f"{topic.lower()}-{len(articles)}",
-                    'title': title,
-                    'description': (description or title)[:250],
-                    'url': url,
-                    'publishedDate': published,
-                    'source': source,
-                    'image': image,
-                    'topic': topic.lower(),
-                })
-            except Exception:
-                logger.exception("Error parsing RSS entry")
-                continue
-
+        if articles:
+            with _news_cache_lock:
+                _news_cache[rss_url] = articles
         return articles
     except Exception:
         logger.exception("Failed to fetch news RSS")
@@ -520,13 +752,13 @@ def fetch_news_from_rss(topic: str):
 
 
 @app.get(f"{settings.API_PREFIX}/news/{{topic}}", tags=["News"], summary="Proxy Google News RSS for a topic")
-def get_news_proxy(topic: str):
+async def get_news_proxy(topic: str):
     """GET /api/news/{topic} - return news articles for the given topic from Google News RSS."""
     topic_clean = (topic or '').strip()
     if not topic_clean:
         raise HTTPException(status_code=400, detail="Topic is required")
 
-    articles = fetch_news_from_rss(topic_clean)
+    articles = await fetch_news_from_rss(app.state.http_client, topic_clean)
     if not articles:
         raise HTTPException(status_code=404, detail=f"No news found for '{topic_clean}'")
 
@@ -542,7 +774,7 @@ def get_news_proxy(topic: str):
 )
 def health_check() -> HealthCheckResponse:
     """Perform comprehensive health check."""
-    active_sessions = len(sessions.get_all_sessions())
+    active_sessions = sessions.get_session_count()
     uptime = (
         (datetime.utcnow() - app_start_time).total_seconds()
         if app_start_time
@@ -575,10 +807,10 @@ def health_check_detailed():
         else 0
     )
     
-    all_sessions = sessions.get_all_sessions()
+    stats = sessions.get_session_stats()
     session_details = {
-        "total_active": len(all_sessions),
-        "oldest_session_age_seconds": sessions.get_oldest_session_age(),
+        "total_active": stats["total_active"],
+        "oldest_session_age_seconds": stats["oldest_session_age_seconds"],
     }
     
     return {
@@ -610,8 +842,9 @@ async def debug_upload(request: Request):
                 filename = getattr(value, "filename", None)
                 # read small preview (don't load huge files into memory)
                 try:
-                    content = await value.read()
-                    size = len(content) if content is not None else None
+                    await value.read(4096)
+                    value.file.seek(0, os.SEEK_END)
+                    size = value.file.tell()
                 except Exception:
                     size = None
                 files.append({"field": key, "filename": filename, "size": size})
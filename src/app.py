@@ -53,8 +53,8 @@ if uploaded_file:
         if st.checkbox("Show Retrieved Chunks"):
             from embedding_store import search
             results = search(query, st.session_state.index, st.session_state.chunk_map, top_k=3)
-            for i, (chunk, dist) in enumerate(results, 1):
-                st.markdown(f"**Chunk {i} (distance={dist:.4f}):**")
+            for i, (chunk, score) in enumerate(results, 1):
+                st.markdown(f"**Chunk {i} (similarity={score:.4f}):**")
                 st.text(chunk)
 
     # 5️⃣ Optional: Summarize document
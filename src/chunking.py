@@ -1,22 +1,45 @@
-import re
+from dataclasses import dataclass
+from typing import Iterator, List
+
+import numpy as np
+
+
+@dataclass
+class ChunkSet:
+    """Chunks stored as (start, end) offsets into one cleaned text buffer."""
+    text: str
+    starts: np.ndarray
+    ends: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> str:
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        text = self.text
+        return (text[s:e] for s, e in zip(self.starts.tolist(), self.ends.tolist()))
+
+    def tolist(self) -> List[str]:
+        """Materialize all chunks as strings in a single pass."""
+        return list(self)
+
 
 def clean_text(text: str) -> str:
     """Remove extra spaces/newlines."""
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    # str.split() with no separator collapses whitespace runs and trims the ends in C
+    return ' '.join(text.split())
 
-def chunk_text(text: str, max_length: int = 500, overlap: int = 50) -> list:
+def chunk_text(text: str, max_length: int = 500, overlap: int = 50) -> ChunkSet:
     """
     Split text into chunks of ~max_length characters with optional overlap.
     """
     text = clean_text(text)
-    chunks = []
-    start = 0
     text_len = len(text)
 
-    while start < text_len:
-        end = min(start + max_length, text_len)
-        chunks.append(text[start:end])
-        start += max_length - overlap
+    # Chunk offsets are computed as arrays rather than in a Python loop
+    starts = np.arange(0, text_len, max_length - overlap, dtype=np.int64)
+    ends = np.minimum(starts + max_length, text_len)
 
-    return chunks
+    return ChunkSet(text, starts, ends)
@@ -1,6 +1,8 @@
-from pydantic_settings import BaseSettings
-from pydantic import validator
-from typing import List
+from functools import cached_property
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import field_validator
+from typing import FrozenSet, List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,6 +17,8 @@ class Settings(BaseSettings):
     # File upload settings
     MAX_FILE_SIZE_MB: int = 20
     ALLOWED_FILE_TYPES: List[str] = ["pdf", "png", "jpg", "jpeg", "docx", "txt", "tiff", "bmp"]
+    # Images are validated by magic bytes; also run PIL's full verify() when set
+    VERIFY_IMAGES_WITH_PIL: bool = False
 
     # RAG / Chunking settings
     CHUNK_SIZE: int = 500
@@ -25,12 +29,29 @@ class Settings(BaseSettings):
     SESSION_MAX_AGE_HOURS: int = 24
     SESSION_CLEANUP_INTERVAL_MINUTES: int = 60
 
+    # On-disk cache of FAISS indexes keyed by upload content hash
+    INDEX_CACHE_DIR: str = "cache/index"
+    INDEX_CACHE_MAX_ENTRIES: int = 100
+
+    # Opt-in int8 ONNX Runtime encoder for CPU hosts (needs sentence-transformers[onnx])
+    EMBEDDING_ONNX_INT8: bool = False
+
+    # OpenMP threads used by FAISS searches (unset: min(4, CPU count))
+    FAISS_OMP_THREADS: Optional[int] = None
+
+    # News proxy response cache
+    NEWS_CACHE_TTL_SECONDS: int = 60
+    NEWS_CACHE_MAX_ENTRIES: int = 256
+
     # Embedding and LLM models
     EMBEDDING_MODEL: str = "text-embedding-004"   # Best Gemini embedding model
 
     # ⭐ Latest working Gemini 2.5 Flash model
     LLM_MODEL: str = "gemini-2.5-flash"
 
+    # Document text sent to the LLM is clamped to this many characters (~4 chars per token)
+    LLM_MAX_CONTEXT_CHARS: int = 400_000
+
     # API configuration
     CORS_ORIGINS: List[str] = [
         "http://localhost:5173",
@@ -42,32 +63,46 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     ENABLE_API_DOCS: bool = True
 
+    # Concurrent connections per worker before uvicorn answers 503 (unset: no cap)
+    LIMIT_CONCURRENCY: Optional[int] = None
+
+    # Extraction processes per server worker (default: CPU count / WEB_CONCURRENCY)
+    CPU_POOL_WORKERS: Optional[int] = None
+
     # Logging configuration
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/api.log"
 
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env")
+
+    @cached_property
+    def ALLOWED_FILE_TYPES_SET(self) -> FrozenSet[str]:
+        """Lowercased ALLOWED_FILE_TYPES for O(1) extension checks, built once."""
+        return frozenset(e.lower() for e in self.ALLOWED_FILE_TYPES)
 
-    @validator("GEMINI_API_KEY")
+    @field_validator("GEMINI_API_KEY")
+    @classmethod
     def validate_api_key(cls, v):
         if not v or v.strip() == "":
             raise ValueError("GEMINI_API_KEY must be set to a non-empty value")
         return v
 
-    @validator("MAX_FILE_SIZE_MB")
+    @field_validator("MAX_FILE_SIZE_MB")
+    @classmethod
     def validate_max_file_size(cls, v):
         if v < 1 or v > 100:
             raise ValueError("MAX_FILE_SIZE_MB must be between 1 and 100")
         return v
 
-    @validator("CORS_ORIGINS", pre=True)
+    @field_validator("CORS_ORIGINS", mode="before")
+    @classmethod
     def parse_cors_origins(cls, v):
         if isinstance(v, str):
             return [origin.strip() for origin in v.split(",")]
         return v
 
-    @validator("LOG_LEVEL")
+    @field_validator("LOG_LEVEL")
+    @classmethod
     def validate_log_level(cls, v):
         valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         if v.upper() not in valid_levels:
@@ -43,27 +43,105 @@
 import os
 import pdfplumber
 import docx
-from typing import Optional
+from typing import Tuple
+
+# Optional native PDF backend (MuPDF); pdfplumber is used when it is missing
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_ENABLED = True
+except Exception:
+    fitz = None  # type: ignore
+    PYMUPDF_ENABLED = False
 
 # Optional OCR support for images
 try:
-    from PIL import Image
+    from PIL import Image, ImageOps, ImageSequence
     import pytesseract
     OCR_ENABLED = True
 except Exception:
     Image = None  # type: ignore
+    ImageOps = None  # type: ignore
+    ImageSequence = None  # type: ignore
     pytesseract = None  # type: ignore
     OCR_ENABLED = False
 
-def load_pdf(file_path: str) -> str:
-    """Extract text from a PDF file."""
-    text = ""
+# Optional GPU OCR backend; only used when a CUDA device is present
+try:
+    import paddle
+    from paddleocr import PaddleOCR
+    PADDLEOCR_ENABLED = paddle.device.cuda.device_count() > 0
+except Exception:
+    PaddleOCR = None  # type: ignore
+    PADDLEOCR_ENABLED = False
+
+_paddle_ocr = None
+
+def _get_paddle_ocr():
+    global _paddle_ocr
+    if _paddle_ocr is None:
+        _paddle_ocr = PaddleOCR(use_gpu=True, lang="en", show_log=False)
+    return _paddle_ocr
+
+def load_pdf(file_path: str) -> Tuple[str, int]:
+    """Extract text from a PDF file and return it with the page count.
+
+    Uses PyMuPDF when installed, falling back to pdfplumber when it is not
+    or when MuPDF finds no text layer. Runs in-process: the API already calls
+    this from its own process pool, so uploads are parallel across workers.
+    """
+    if PYMUPDF_ENABLED:
+        with fitz.open(file_path) as doc:
+            n_pages = doc.page_count
+            text = "\n".join(page.get_text("text") for page in doc).strip()
+        if text:
+            return text, n_pages
+
     with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text.strip()
+        parts = filter(None, (page.extract_text() for page in pdf.pages))
+        return "\n".join(parts).strip(), len(pdf.pages)
+
+def warm_up():
+    """Process pool initializer: pay heavy import and Tesseract start-up costs once per worker.
+
+    The parser modules are already imported at module load; this also runs a
+    dummy OCR so the first real image does not absorb the engine start-up.
+    """
+    if OCR_ENABLED and not PADDLEOCR_ENABLED:
+        try:
+            pytesseract.image_to_string(Image.new("L", (10, 10), 255))
+        except Exception:
+            pass
+
+def _preprocess_for_ocr(img):
+    """Convert to grayscale and stretch contrast before OCR."""
+    return ImageOps.autocontrast(img.convert("L"))
+
+def _ocr_frame(img) -> str:
+    """OCR a single PIL frame with PaddleOCR on GPU, or Tesseract otherwise."""
+    img = _preprocess_for_ocr(img)
+    if PADDLEOCR_ENABLED:
+        import numpy as np
+        result = _get_paddle_ocr().ocr(np.array(img.convert("RGB")))
+        return "\n".join(line[1][0] for page in result if page for line in page)
+    return pytesseract.image_to_string(img)
+
+def load_image(file_path: str) -> Tuple[str, int]:
+    """OCR an image file and return the text with its frame count.
+
+    Multi-page TIFFs are OCRed frame by frame in this process; the API
+    already runs it in a pool worker, so no nested pool is forked.
+    """
+    if not OCR_ENABLED:
+        raise RuntimeError("OCR support not available. Install Pillow and pytesseract and ensure Tesseract is installed on the system.")
+    try:
+        with Image.open(file_path) as img:
+            n_frames = getattr(img, "n_frames", 1)
+            if n_frames == 1:
+                return _ocr_frame(img).strip(), 1
+            parts = [_ocr_frame(frame) for frame in ImageSequence.Iterator(img)]
+            return "\n".join(parts).strip(), n_frames
+    except Exception as e:
+        raise RuntimeError(f"Failed to OCR image: {e}")
 
 def load_docx(file_path: str) -> str:
     """Extract text from a DOCX file."""
@@ -85,21 +163,15 @@ def load_document(file_path: str) -> str:
     ext = os.path.splitext(file_path)[1].lower()
 
     if ext == ".pdf":
-        return load_pdf(file_path)
+        text, _ = load_pdf(file_path)
+        return text
     elif ext == ".docx":
         return load_docx(file_path)
     elif ext == ".txt":
         return load_txt(file_path)
     elif ext in [".png", ".jpg", ".jpeg", ".tiff", ".bmp"]:
-        if not OCR_ENABLED:
-            raise RuntimeError("OCR support not available. Install Pillow and pytesseract and ensure Tesseract is installed on the system.")
-        # perform OCR on the image and return extracted text
-        try:
-            img = Image.open(file_path)
-            text = pytesseract.image_to_string(img)
-            return text.strip()
-        except Exception as e:
-            raise RuntimeError(f"Failed to OCR image: {e}")
+        text, _ = load_image(file_path)
+        return text
     else:
         raise ValueError(f"Unsupported file type: {ext}")
 
@@ -119,12 +191,7 @@ def load_document_with_meta(file_path: str) -> dict:
 
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
-        text = load_pdf(file_path)
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                pages = len(pdf.pages)
-        except Exception:
-            pages = 0
+        text, pages = load_pdf(file_path)
         return {"text": text, "pages": pages, "file_type": "pdf"}
     elif ext == ".docx":
         text = load_docx(file_path)
@@ -134,13 +201,7 @@ def load_document_with_meta(file_path: str) -> dict:
         lines = len(text.splitlines()) if text else 0
         return {"text": text, "pages": lines, "file_type": "txt"}
     elif ext in [".png", ".jpg", ".jpeg", ".tiff", ".bmp"]:
-        if not OCR_ENABLED:
-            raise RuntimeError("OCR support not available. Install Pillow and pytesseract and ensure Tesseract is installed on the system.")
-        try:
-            img = Image.open(file_path)
-            text = pytesseract.image_to_string(img)
-            return {"text": text.strip(), "pages": 1, "file_type": "image"}
-        except Exception as e:
-            raise RuntimeError(f"Failed to OCR image: {e}")
+        text, pages = load_image(file_path)
+        return {"text": text, "pages": pages, "file_type": "image"}
     else:
         raise ValueError(f"Unsupported file type: {ext}")
@@ -1,39 +1,255 @@
 
 
+import asyncio
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import List, Optional, Sequence
+from cachetools import LRUCache
 from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
+import torch
 
-# Load embedding model once
-model = SentenceTransformer("all-MiniLM-L6-v2")
+from config import settings
 
-def build_faiss_index(chunks: list):
-    """Build FAISS index from text chunks and return index + id->chunk map."""
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Opt-in int8 encoder on CPU: the model repo ships a dynamically quantized ONNX
+# export for AVX512-VNNI, run through sentence-transformers' ONNX Runtime backend
+USE_ONNX_INT8 = settings.EMBEDDING_ONNX_INT8
+ONNX_INT8_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+def _pick_device() -> str:
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+@lru_cache(maxsize=1)
+def get_model() -> SentenceTransformer:
+    """Load the embedding model on first use, on the GPU when there is one (in fp16 there)."""
+    device = _pick_device()
+    if USE_ONNX_INT8 and device == "cpu":
+        try:
+            return SentenceTransformer(
+                EMBEDDING_MODEL_NAME,
+                device=device,
+                backend="onnx",
+                model_kwargs={"file_name": ONNX_INT8_FILE},
+            )
+        except Exception:
+            logger.exception("Could not load the int8 ONNX encoder; falling back to PyTorch")
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME, device=device)
+    if device == "cuda":
+        model.half()
+    return model
+
+EMBED_BATCH_SIZE = 64
+
+def set_faiss_threads(n: Optional[int] = None) -> None:
+    """Cap FAISS's OpenMP threads (default: min(4, CPU count)); called once at startup.
+
+    Single-query searches gain nothing from wide OpenMP fan-out; capping it
+    avoids per-query thread wake-ups and cache thrash on many-core hosts.
+    """
+    faiss.omp_set_num_threads(n or min(4, os.cpu_count() or 1))
+
+# Documents with at least this many chunks get a compressed IVF-PQ index;
+# smaller ones use an HNSW graph over the full vectors
+IVF_PQ_MIN_CHUNKS = 10_000
+HNSW_M = 32
+PQ_M = 32  # must divide the embedding dimension (384 for MiniLM)
+
+# Indexes live on the GPU when faiss-gpu sees one. GPU FAISS has no HNSW, so
+# small documents use an exact flat index there instead
+GPU_ENABLED = hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0
+_gpu_resources = faiss.StandardGpuResources() if GPU_ENABLED else None
+# A GpuResources object must not be used from several threads at once
+_gpu_lock = threading.Lock()
+
+# Bumped whenever the index layout or metric changes, to invalidate cached indexes
+INDEX_FORMAT = ("ip-v1-qint8" if USE_ONNX_INT8 else "ip-v1") + ("-gpu" if GPU_ENABLED else "")
+
+# Search-time speed/recall knobs, stored on the index so cached copies keep them
+HNSW_EF_SEARCH = 64
+IVF_NPROBE = 8
+
+def _make_index(embeddings: np.ndarray):
+    """Pick and build an inner-product ANN index suited to the number of (unit) vectors."""
+    n, dim = embeddings.shape
+    if n < IVF_PQ_MIN_CHUNKS and GPU_ENABLED:
+        index = faiss.IndexFlatIP(dim)
+    elif n < IVF_PQ_MIN_CHUNKS:
+        index = faiss.index_factory(dim, f"HNSW{HNSW_M}", faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+    else:
+        # FAISS wants ~39 training points per centroid
+        nlist = min(int(4 * np.sqrt(n)), n // 39)
+        index = faiss.index_factory(dim, f"IVF{nlist},PQ{PQ_M}", faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+        index.nprobe = IVF_NPROBE
+    index.add(embeddings)
+    return index
+
+def to_device(index):
+    """Move a CPU index to the GPU when one is available, else return it unchanged."""
+    if not GPU_ENABLED:
+        return index
+    try:
+        with _gpu_lock:
+            return faiss.index_cpu_to_gpu(_gpu_resources, 0, index)
+    except Exception:
+        logger.exception("Could not move FAISS index to GPU; searching on CPU")
+        return index
+
+def to_cpu(index):
+    """Return a CPU copy of a GPU index (for serialization); CPU indexes pass through."""
+    if GPU_ENABLED and isinstance(index, faiss.GpuIndex):
+        with _gpu_lock:
+            return faiss.index_gpu_to_cpu(index)
+    return index
+
+def build_faiss_index(chunks):
+    """Build FAISS index from text chunks (a list or ChunkSet) and return index + chunk tuple.
+
+    The tuple is indexed by FAISS id, so it serves as the id->chunk map.
+    """
     if not chunks:
         raise ValueError("No chunks provided to build FAISS index")
-    
-    embeddings = model.encode(chunks)
-    embeddings = np.array(embeddings).astype("float32")
-
-    # Handle case where embeddings might be 1D (single chunk)
-    if embeddings.ndim == 1:
-        embeddings = embeddings.reshape(1, -1)
-    
-    dim = embeddings.shape[1]
-    index = faiss.IndexFlatL2(dim)
-    index.add(embeddings)
 
-    chunk_map = {i: chunk for i, chunk in enumerate(chunks)}
-    return index, chunk_map
+    # Slice every chunk once; the encoder tokenizes the whole list in batches.
+    # encode() already length-sorts inputs internally so each minibatch pads little
+    chunks = chunks.tolist() if hasattr(chunks, "tolist") else list(chunks)
+    embeddings = get_model().encode(
+        chunks,
+        batch_size=EMBED_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    # A list input always yields a 2D array; the encoder already returns
+    # float32 (possibly fp16 on GPU), so these only copy when a conversion is needed
+    embeddings = np.ascontiguousarray(embeddings.astype(np.float32, copy=False))
+
+    # Embeddings are unit vectors, so inner product equals cosine similarity
+    index = to_device(_make_index(embeddings))
+
+    return index, tuple(chunks)
+
+# Memoized query vectors, shared by embed_query and EmbeddingBatcher
+_query_cache: LRUCache = LRUCache(maxsize=4096)
+_query_cache_lock = threading.Lock()
+
+def _encode_queries(queries: List[str]) -> np.ndarray:
+    """Embed and L2-normalize queries in one encoder call; rows are read-only."""
+    query_vecs = get_model().encode(
+        queries, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False
+    ).astype(np.float32, copy=False)
+    assert query_vecs.flags["C_CONTIGUOUS"]
+    # Shared between callers through the cache, so keep it immutable
+    query_vecs.flags.writeable = False
+    return query_vecs
+
+def embed_query(query: str) -> np.ndarray:
+    """Embed and L2-normalize a query, memoized so repeated queries skip the encoder."""
+    with _query_cache_lock:
+        query_vec = _query_cache.get(query)
+    if query_vec is None:
+        query_vec = _encode_queries([query])
+        with _query_cache_lock:
+            _query_cache[query] = query_vec
+    return query_vec
+
+class EmbeddingBatcher:
+    """Coalesces concurrent query embeddings into a single encoder call.
+
+    Requests arriving within `window_ms` of the first queued one (up to
+    `max_batch`) are encoded together in a worker thread, and each caller's
+    future is resolved with its own (1, dim) row.
+    """
+
+    def __init__(self, max_batch: int = 32, window_ms: float = 10.0):
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
 
-def search(query: str, index, chunk_map: dict, top_k: int = 3):
-    """Search top_k relevant chunks for a query."""
-    query_vec = model.encode([query])
-    query_vec = np.array(query_vec).astype("float32")
+    async def embed(self, query: str) -> np.ndarray:
+        with _query_cache_lock:
+            cached = _query_cache.get(query)
+        if cached is not None:
+            return cached
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, future))
+        return await future
 
-    distances, indices = index.search(query_vec, top_k)
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            queries = list(dict.fromkeys(query for query, _ in batch))
+            try:
+                query_vecs = await asyncio.to_thread(_encode_queries, queries)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            rows = {query: query_vecs[i:i + 1] for i, query in enumerate(queries)}
+            with _query_cache_lock:
+                _query_cache.update(rows)
+            for query, future in batch:
+                if not future.done():
+                    future.set_result(rows[query])
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+# Shared batcher for async callers
+embedding_batcher = EmbeddingBatcher()
+
+def search(query: str, index, chunk_map: Sequence[str], top_k: int = 3, query_vec: np.ndarray = None):
+    """Search top_k relevant chunks for a query (or a precomputed, normalized query vector).
+
+    Returns (chunk, cosine_similarity) pairs, most similar first.
+    """
+    if query_vec is None:
+        query_vec = embed_query(query)
+
+    if GPU_ENABLED:
+        with _gpu_lock:
+            scores, indices = index.search(query_vec, top_k)
+    else:
+        scores, indices = index.search(query_vec, top_k)
     results = []
-    for idx, dist in zip(indices[0], distances[0]):
+    for idx, score in zip(indices[0], scores[0]):
         if idx != -1:
-            results.append((chunk_map[idx], float(dist)))
+            results.append((chunk_map[idx], float(score)))
     return results
+
+async def asearch(query: str, index, chunk_map: Sequence[str], top_k: int = 3, query_vec: np.ndarray = None):
+    """Async `search`: embeds through the shared batcher and runs FAISS (which releases the GIL) in a thread."""
+    if query_vec is None:
+        query_vec = await embedding_batcher.embed(query)
+    return await asyncio.to_thread(search, query, index, chunk_map, top_k, query_vec)
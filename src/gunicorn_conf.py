@@ -0,0 +1,20 @@
+"""Gunicorn settings for running the API with one uvicorn worker per CPU.
+
+Run from the src/ directory:
+    gunicorn -c gunicorn_conf.py api:app
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"  # uvloop + httptools when installed
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Workers read this to size their extraction process pools, so the host runs
+# about one extraction process per core in total rather than workers x cores
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_connections = 1000
+keepalive = 5
+
+# LLM calls can take tens of seconds; don't let the arbiter kill busy workers
+timeout = 120
+graceful_timeout = 30
@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Optional
+
+import faiss
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.faiss"
+CHUNKS_FILE = "chunks.json"
+TEXT_FILE = "text.txt"
+META_FILE = "meta.json"
+
+# Entries are built in "<key>.tmp-<pid>-<thread>" and renamed into place
+TMP_SUFFIX = ".tmp-"
+STALE_TMP_SECONDS = 3600
+
+# Cached indexes are memory-mapped rather than read into RAM, so a cache hit
+# costs almost no heap and workers share the pages through the OS page cache.
+# IO_FLAG_MMAP_IFC maps flat vector storage (HNSW, Flat); older FAISS only has
+# IO_FLAG_MMAP, which maps IVF inverted lists. Mapping is only safe because
+# save_cached publishes entries atomically and never rewrites them; eviction
+# unlinks files, which leaves existing mappings valid on POSIX
+INDEX_READ_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+
+def load_cached(cache_dir: str, key: str) -> Optional[dict]:
+    """Load a cached index, chunks, text and metadata for `key`, or return None on a miss.
+
+    The index is memory-mapped read-only; sessions only ever search it, and a
+    published entry's files never change underneath the mapping.
+
+    Returns:
+        {"index", "chunks", "text", "pages", "file_type"}
+    """
+    entry_dir = os.path.join(cache_dir, key)
+    if not os.path.exists(os.path.join(entry_dir, META_FILE)):
+        return None
+    try:
+        index = faiss.read_index(os.path.join(entry_dir, INDEX_FILE), INDEX_READ_FLAGS)
+        with open(os.path.join(entry_dir, CHUNKS_FILE), "r", encoding="utf-8") as f:
+            chunks = json.load(f)
+        with open(os.path.join(entry_dir, TEXT_FILE), "r", encoding="utf-8") as f:
+            text = f.read()
+        with open(os.path.join(entry_dir, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        # Mark as recently used for LRU eviction
+        os.utime(entry_dir)
+    except Exception:
+        logger.exception("Failed to load index cache entry %s", key)
+        return None
+    return {
+        "index": index,
+        "chunks": chunks,
+        "text": text,
+        "pages": meta.get("pages", 0),
+        "file_type": meta.get("file_type"),
+    }
+
+
+def save_cached(cache_dir: str, key: str, index, chunks, text: str, pages: int, file_type: Optional[str]):
+    """Persist an index and its chunks, text and metadata under `key`. Failures are logged, not raised.
+
+    The entry is written to a private temp directory and renamed into place,
+    so readers only ever see complete entries. Published entries are never
+    rewritten: other sessions may have their index memory-mapped.
+    """
+    entry_dir = os.path.join(cache_dir, key)
+    if os.path.exists(os.path.join(entry_dir, META_FILE)):
+        return
+    tmp_dir = f"{entry_dir}{TMP_SUFFIX}{os.getpid()}-{threading.get_ident()}"
+    try:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        faiss.write_index(index, os.path.join(tmp_dir, INDEX_FILE))
+        with open(os.path.join(tmp_dir, CHUNKS_FILE), "w", encoding="utf-8") as f:
+            json.dump(list(chunks), f)
+        with open(os.path.join(tmp_dir, TEXT_FILE), "w", encoding="utf-8") as f:
+            f.write(text)
+        with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"pages": pages, "file_type": file_type}, f)
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            if os.path.exists(os.path.join(entry_dir, META_FILE)):
+                # A concurrent miss for the same key published first; keep theirs
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return
+            # Incomplete leftover from an older, non-atomic writer
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+    except Exception:
+        logger.exception("Failed to write index cache entry %s", key)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def evict_lru(cache_dir: str, max_entries: int) -> int:
+    """Remove least recently used entries beyond `max_entries` and return how many were removed."""
+    if not os.path.isdir(cache_dir):
+        return 0
+    entries = []
+    for e in os.scandir(cache_dir):
+        if not e.is_dir():
+            continue
+        if TMP_SUFFIX in e.name:
+            # In-progress writes belong to their writer; only sweep ones abandoned by a crash
+            if time.time() - e.stat().st_mtime > STALE_TMP_SECONDS:
+                shutil.rmtree(e.path, ignore_errors=True)
+            continue
+        entries.append(e)
+    if len(entries) <= max_entries:
+        return 0
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    to_remove = entries[: len(entries) - max_entries]
+    for e in to_remove:
+        shutil.rmtree(e.path, ignore_errors=True)
+    return len(to_remove)
@@ -1,10 +1,15 @@
+import hashlib
 import logging
+import threading
+from typing import Optional
+
 import google.generativeai as genai
+from cachetools import TTLCache
 from config import settings
 
 """LLM interface wrapper.
 
-Uses configuration from `config.settings` and exposes `query_llm`.
+Uses configuration from `config.settings` and exposes `query_llm` and `aquery_llm`.
 """
 
 # Configure client using the value from settings (validated at startup)
@@ -19,31 +24,86 @@ model = genai.GenerativeModel(MODEL_NAME)
 
 logger = logging.getLogger(__name__)
 
-def query_llm(prompt: str) -> str:
+# Answers keyed by (session_id, prompt digest); failures and empty answers are never cached
+_answer_cache: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+_answer_cache_lock = threading.Lock()
+
+def _prompt_key(prompt: str, session_id: Optional[str]) -> tuple:
+    return (session_id or "", hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest())
+
+def invalidate_session(session_id: str) -> None:
+    """Drop cached answers belonging to a deleted session."""
+    with _answer_cache_lock:
+        for key in [k for k in _answer_cache.keys() if k[0] == session_id]:
+            _answer_cache.pop(key, None)
+
+def invalidate_answer(prompt: str, session_id: Optional[str] = None) -> None:
+    """Drop one cached answer, e.g. when the caller could not use it and a retry should re-ask."""
+    with _answer_cache_lock:
+        _answer_cache.pop(_prompt_key(prompt, session_id), None)
+
+def _response_text(response) -> str:
+    # Depending on the client library the attribute name may differ
+    text = getattr(response, "text", None) or getattr(response, "content", None)
+    if text is None:
+        # Fallback: stringify the response
+        text = str(response)
+    return text
+
+def _llm_error(e: Exception) -> RuntimeError:
+    """Log a failed call and wrap it in a RuntimeError with a hint for missing models."""
+    logger.exception("LLM query failed")
+    msg = str(e)
+    if "not found" in msg.lower() or "not supported" in msg.lower():
+        hint = (
+            f"Model '{MODEL_NAME}' not available for this API client or version. "
+            "Please set the `LLM_MODEL` environment variable or `settings.LLM_MODEL` to a supported model. "
+            "Run ListModels with your API client to see available models for your account/region."
+        )
+        return RuntimeError(f"Error querying Gemini: {e}. {hint}")
+    return RuntimeError(f"Error querying Gemini: {e}")
+
+def _cache_get(key: tuple) -> Optional[str]:
+    with _answer_cache_lock:
+        return _answer_cache.get(key)
+
+def _cache_put(key: tuple, text: str) -> None:
+    if not text or text.isspace():
+        return
+    with _answer_cache_lock:
+        _answer_cache[key] = text
+
+def query_llm(prompt: str, session_id: Optional[str] = None) -> str:
     """Send a prompt to Gemini and return the response text.
 
+    Identical prompts within a session are answered from a 1-hour TTL cache.
     Raises RuntimeError on failure so callers can convert to HTTP errors.
     """
+    key = _prompt_key(prompt, session_id)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        text = _response_text(model.generate_content(prompt))
+    except Exception as e:
+        raise _llm_error(e) from e
+    _cache_put(key, text)
+    return text
+
+async def aquery_llm(prompt: str, session_id: Optional[str] = None) -> str:
+    """Async variant of `query_llm` using the client's native coroutine API."""
+    key = _prompt_key(prompt, session_id)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
     try:
-        response = model.generate_content(prompt)
-        # Depending on the client library the attribute name may differ
-        text = getattr(response, "text", None) or getattr(response, "content", None)
-        if text is None:
-            # Fallback: stringify the response
-            text = str(response)
-        return text
+        text = _response_text(await model.generate_content_async(prompt))
     except Exception as e:
-        # Provide a clearer error message for missing/unsupported models
-        logger.exception("LLM query failed")
-        msg = str(e)
-        if "not found" in msg.lower() or "not supported" in msg.lower():
-            hint = (
-                f"Model '{MODEL_NAME}' not available for this API client or version. "
-                "Please set the `LLM_MODEL` environment variable or `settings.LLM_MODEL` to a supported model. "
-                "Run ListModels with your API client to see available models for your account/region."
-            )
-            raise RuntimeError(f"Error querying Gemini: {e}. {hint}") from e
-        raise RuntimeError(f"Error querying Gemini: {e}") from e
+        raise _llm_error(e) from e
+    _cache_put(key, text)
+    return text
 
 def get_model_info() -> dict:
     """Return basic model info used by this service."""
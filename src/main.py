@@ -79,6 +79,10 @@ if __name__ == "__main__":
     
     # Import app after configuration
     from api import app
+
+    # Load the embedding model now rather than on the first upload or query
+    from embedding_store import get_model
+    get_model()
     
     logger.info("Starting uvicorn server...")
     
@@ -91,4 +95,7 @@ if __name__ == "__main__":
         log_level=settings.LOG_LEVEL.lower(),
         access_log=True,
         workers=1,
+        loop="auto",  # uvloop when installed
+        http="auto",  # httptools when installed
+        limit_concurrency=settings.LIMIT_CONCURRENCY,
     )
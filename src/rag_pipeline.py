@@ -1,16 +1,12 @@
 
 
-from embedding_store import search
-from llm_interface import query_llm
+from embedding_store import asearch, search
+from llm_interface import aquery_llm, query_llm
 
-def rag_query(user_query: str, index, chunk_map, top_k: int = 3) -> str:
-    """
-    Retrieve top_k chunks from FAISS and generate a LLM answer.
-    """
-    results = search(user_query, index, chunk_map, top_k=top_k)
+def _build_prompt(user_query: str, results) -> str:
     retrieved_text = "\n\n".join([chunk for chunk, _ in results])
 
-    prompt = f"""
+    return f"""
 You are a legal assistant AI.
 Use the following extracted contract clauses to answer the user's question.
 
@@ -22,5 +18,22 @@ Question:
 
 Answer concisely based only on the above excerpts.
 """
-    answer = query_llm(prompt)
+
+def rag_query(user_query: str, index, chunk_map, top_k: int = 3, query_vec=None, session_id=None) -> str:
+    """
+    Retrieve top_k chunks from FAISS and generate a LLM answer.
+    Pass `query_vec` to reuse an already computed query embedding, and
+    `session_id` to scope the LLM answer cache.
+    """
+    results = search(user_query, index, chunk_map, top_k=top_k, query_vec=query_vec)
+    answer = query_llm(_build_prompt(user_query, results), session_id=session_id)
+    return answer
+
+async def arag_query(user_query: str, index, chunk_map, top_k: int = 3, query_vec=None, session_id=None) -> str:
+    """
+    Async variant of `rag_query`: the query embedding goes through the shared
+    micro-batcher and the LLM call is awaited rather than blocking a thread.
+    """
+    results = await asearch(user_query, index, chunk_map, top_k=top_k, query_vec=query_vec)
+    answer = await aquery_llm(_build_prompt(user_query, results), session_id=session_id)
     return answer
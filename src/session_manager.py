@@ -1,10 +1,10 @@
 import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
 import logging
 
-from utils import is_session_expired
-
 logger = logging.getLogger(__name__)
 
 
@@ -18,95 +18,167 @@ class SessionExpiredError(Exception):
     pass
 
 
-class SessionManager:
-    """Thread-safe in-memory session manager for FAISS indices and document state."""
+class RWLock:
+    """Writer-preferring reader-writer lock: many concurrent readers or one writer."""
 
     def __init__(self):
-        self.sessions: Dict[str, Dict[str, Any]] = {}
-        self.lock = threading.Lock()
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
 
-    def create_session(self, index, chunk_map: dict, file_text: str, filename: str) -> str:
+
+class SessionManager:
+    """Thread-safe in-memory session manager for FAISS indices and document state.
+
+    Lookups share a read lock so concurrent queries on different sessions do not
+    serialize; only creating, updating and removing sessions takes the write lock.
+    """
+
+    def __init__(self, on_delete: Optional[Callable[[str], None]] = None, max_age_hours: int = 24):
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.max_age_seconds = max_age_hours * 3600
+        self.lock = RWLock()
+        # Called with each removed session_id, outside the lock (e.g. to drop cached LLM answers)
+        self.on_delete = on_delete
+
+    def _notify_deleted(self, session_id: str):
+        if self.on_delete is None:
+            return
+        try:
+            self.on_delete(session_id)
+        except Exception:
+            logger.exception("on_delete callback failed for session %s", session_id)
+
+    def create_session(self, index, chunk_map: Sequence[str], filename: str, context: str = "") -> str:
+        """Store a document's index, chunks and LLM context; return the new session id.
+
+        `context` is the only copy of the document text a session holds: the
+        text clamped to the LLM context budget, which endpoints join with their
+        prompt templates per request. The full text is not kept.
+        """
         import uuid
         session_id = uuid.uuid4().hex
         entry = {
             "index": index,
             "chunk_map": chunk_map,
-            "file_text": file_text,
             "filename": filename,
+            "context": context,
             "created_at": datetime.utcnow(),
             "last_accessed_at": datetime.utcnow(),
+            # Monotonic deadline so expiry checks are a single float compare
+            "expires_at_ts": time.monotonic() + self.max_age_seconds,
         }
-        with self.lock:
+        with self.lock.write():
             self.sessions[session_id] = entry
         logger.info("Created session %s for file %s", session_id, filename)
         return session_id
 
+    def _expire(self, session_id: str, entry: dict):
+        """Remove an expired entry found under the read lock, if nobody replaced it meanwhile."""
+        with self.lock.write():
+            if self.sessions.get(session_id) is not entry:
+                return
+            del self.sessions[session_id]
+        self._notify_deleted(session_id)
+
     def get_session(self, session_id: str) -> dict:
-        with self.lock:
+        with self.lock.read():
             entry = self.sessions.get(session_id)
             if not entry:
                 raise SessionNotFoundError(f"Session not found: {session_id}")
             
             # Check expiry
-            created_at = entry.get("created_at")
-            if created_at and is_session_expired(created_at, max_age_hours=24):
-                del self.sessions[session_id]
-                raise SessionExpiredError(f"Session expired: {session_id}")
-            
-            # Update last accessed time
-            entry["last_accessed_at"] = datetime.utcnow()
-            return entry
+            if time.monotonic() <= entry["expires_at_ts"]:
+                # Update last accessed time (a single key store, safe under the read lock)
+                entry["last_accessed_at"] = datetime.utcnow()
+                return entry
+        self._expire(session_id, entry)
+        raise SessionExpiredError(f"Session expired: {session_id}")
 
     def session_exists(self, session_id: str) -> bool:
-        with self.lock:
+        with self.lock.read():
             return session_id in self.sessions
 
     def delete_session(self, session_id: str):
-        with self.lock:
-            if session_id in self.sessions:
-                filename = self.sessions[session_id].get("filename", "unknown")
-                del self.sessions[session_id]
-                logger.info("Deleted session %s (file: %s)", session_id, filename)
+        with self.lock.write():
+            entry = self.sessions.pop(session_id, None)
+        if entry is not None:
+            logger.info("Deleted session %s (file: %s)", session_id, entry.get("filename", "unknown"))
+            self._notify_deleted(session_id)
 
     def update_session(self, session_id: str, **kwargs):
         """Update session metadata."""
-        with self.lock:
+        with self.lock.write():
             if session_id in self.sessions:
                 self.sessions[session_id].update(kwargs)
                 self.sessions[session_id]["last_accessed_at"] = datetime.utcnow()
 
     def get_session_count(self) -> int:
         """Return number of active sessions."""
-        with self.lock:
+        with self.lock.read():
             return len(self.sessions)
 
+    def get_stats_snapshot(self) -> List[Tuple[str, Optional[datetime]]]:
+        """Return lightweight (session_id, created_at) pairs for every session."""
+        with self.lock.read():
+            return [(sid, data.get("created_at")) for sid, data in self.sessions.items()]
+
+    def _age_range(self) -> Tuple[int, float, float]:
+        """Return (count, oldest_age, newest_age) in seconds from one pass over a snapshot."""
+        snapshot = self.get_stats_snapshot()
+        now = datetime.utcnow()
+        oldest = newest = None
+        for _, created_at in snapshot:
+            if created_at:
+                age = (now - created_at).total_seconds()
+                if oldest is None or age > oldest:
+                    oldest = age
+                if newest is None or age < newest:
+                    newest = age
+        return len(snapshot), oldest or 0, newest or 0
+
     def get_oldest_session_age(self) -> float:
         """Return age in seconds of oldest session, or 0 if no sessions."""
-        with self.lock:
-            if not self.sessions:
-                return 0
-            now = datetime.utcnow()
-            ages = [
-                (now - data.get("created_at")).total_seconds()
-                for data in self.sessions.values()
-                if data.get("created_at")
-            ]
-            return max(ages) if ages else 0
+        return self._age_range()[1]
 
     def get_session_stats(self) -> dict:
         """Return comprehensive session statistics."""
-        with self.lock:
-            count = len(self.sessions)
-            ages = [
-                (datetime.utcnow() - data.get("created_at")).total_seconds()
-                for data in self.sessions.values()
-                if data.get("created_at")
-            ]
-            return {
-                "total_active": count,
-                "oldest_session_age_seconds": max(ages) if ages else 0,
-                "newest_session_age_seconds": min(ages) if ages else 0,
-            }
+        count, oldest, newest = self._age_range()
+        return {
+            "total_active": count,
+            "oldest_session_age_seconds": oldest,
+            "newest_session_age_seconds": newest,
+        }
 
     def validate_session(self, session_id: str) -> Tuple[bool, Optional[str]]:
         """Check if session exists and is not expired.
@@ -114,27 +186,26 @@ class SessionManager:
         Returns:
             (is_valid, error_message)
         """
-        with self.lock:
+        with self.lock.read():
             entry = self.sessions.get(session_id)
             if not entry:
                 return False, "Session not found"
             
-            created_at = entry.get("created_at")
-            if created_at and is_session_expired(created_at, max_age_hours=24):
-                del self.sessions[session_id]
-                return False, "Session has expired"
-            
-            return True, None
+            if time.monotonic() <= entry["expires_at_ts"]:
+                return True, None
+        self._expire(session_id, entry)
+        return False, "Session has expired"
 
     def cleanup_expired_sessions(self, max_age_hours: int = 24) -> int:
         """Remove expired sessions and return count of deleted sessions."""
         now = datetime.utcnow()
         to_delete = []
         
-        with self.lock:
-            for sid, data in list(self.sessions.items()):
-                created_at = data.get("created_at")
-                if created_at and is_session_expired(created_at, max_age_hours):
+        with self.lock.write():
+            # Entries expire at creation + max_age_seconds; shift that to the requested age
+            cutoff = time.monotonic() + self.max_age_seconds - max_age_hours * 3600
+            for sid, data in self.sessions.items():
+                if data["expires_at_ts"] <= cutoff:
                     to_delete.append((sid, data))
             
             for sid, data in to_delete:
@@ -143,11 +214,15 @@ class SessionManager:
                 age_hours = (now - data["created_at"]).total_seconds() / 3600
                 logger.debug(f"Cleaned up session {sid} (file: {filename}, age: {age_hours:.1f}h)")
         
+        for sid, _ in to_delete:
+            self._notify_deleted(sid)
+
         if to_delete:
             logger.info(f"Cleanup: removed {len(to_delete)} expired sessions out of {len(self.sessions) + len(to_delete)} total")
         
         return len(to_delete)
 
     def get_all_sessions(self) -> dict:
-        with self.lock:
+        """Return a shallow copy of every session entry (admin/debug use only)."""
+        with self.lock.read():
             return dict(self.sessions)
@@ -1,29 +1,67 @@
+import codecs
+import hashlib
+import mmap
+import multiprocessing
 import os
+import queue
 import tempfile
-import shutil
 import logging
 import logging.handlers
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import AbstractSet, FrozenSet, List, Optional, Sequence, Tuple
+import aiofiles
 from fastapi import UploadFile
 
 logger = logging.getLogger(__name__)
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+HEADER_READ_SIZE = 4096
+
+# Background listeners that own the real log handlers, one per configured logger,
+# with the logger and the QueueHandler feeding it
+_log_listeners: List[Tuple[logging.Logger, logging.handlers.QueueHandler, logging.handlers.QueueListener]] = []
+
+
+# Image signatures checked against the first bytes of an upload
+_IMAGE_MAGIC = {
+    b'\x89PNG': 'png',
+    b'\xff\xd8\xff': 'jpg',
+    b'GIF8': 'gif',
+    b'BM': 'bmp',
+    b'II*\x00': 'tiff',
+    b'MM\x00*': 'tiff',
+}
+_IMAGE_EXT_ALIASES = {'jpeg': 'jpg'}
+
+
+def sniff_image_type(header: bytes) -> Optional[str]:
+    """Return the image type for a file header by magic bytes, or None if unrecognized."""
+    for magic, kind in _IMAGE_MAGIC.items():
+        if header.startswith(magic):
+            return kind
+    return None
+
+
+class FileTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit while streaming."""
+    pass
+
 
 def get_file_extension(filename: str) -> str:
     return os.path.splitext(filename)[1].lstrip('.').lower()
 
 
-def validate_file_type(filename: str, allowed_extensions: List[str]) -> bool:
-    ext = get_file_extension(filename)
-    return ext in [e.lower() for e in allowed_extensions]
+def validate_file_type(filename: str, allowed_extensions: AbstractSet[str]) -> bool:
+    """Check the extension against a set of lowercased extensions (settings.ALLOWED_FILE_TYPES_SET)."""
+    return get_file_extension(filename) in allowed_extensions
 
 
 def validate_upload_file(
     file: UploadFile,
     max_size_mb: int,
-    allowed_types: List[str],
+    allowed_types: AbstractSet[str],
 ) -> Tuple[bool, Optional[str]]:
     """Comprehensive file validation.
     
@@ -41,71 +79,93 @@ def validate_upload_file(
     # Check file type
     if not validate_file_type(file.filename, allowed_types):
         ext = get_file_extension(file.filename)
-        return False, f"File type '{ext}' not allowed. Allowed types: {', '.join(allowed_types)}"
+        return False, f"File type '{ext}' not allowed. Allowed types: {', '.join(sorted(allowed_types))}"
     
     return True, None
 
 
-def validate_file_content(file_path: str) -> Tuple[bool, Optional[str]]:
-    """Validate file content (readable, not corrupted).
-    
+def validate_file_content(
+    file_path: str,
+    salt: str = "",
+    verify_images_with_pil: bool = False,
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Validate file content (readable, not corrupted) and hash it in the same pass.
+
+    The file is memory-mapped so magic-byte checks and the BLAKE2b-128 digest
+    (of `salt` followed by the contents) read straight from the page cache.
+    Images are checked by signature only unless `verify_images_with_pil` is set.
+
     Returns:
-        (is_valid, error_message)
+        (is_valid, error_message, hex_digest)
     """
     try:
         ext = get_file_extension(file_path)
-        size = os.path.getsize(file_path)
         
-        if size == 0:
-            return False, "File is empty"
-        
-        if ext == "pdf":
-            with open(file_path, 'rb') as f:
-                header = f.read(4)
-                if header != b'%PDF':
-                    return False, "Invalid PDF file (missing header)"
-        
-        elif ext == "docx":
-            try:
-                with open(file_path, 'rb') as f:
-                    header = f.read(4)
-                    if header != b'PK\x03\x04':  # ZIP header
-                        return False, "Invalid DOCX file (not a valid ZIP)"
-            except Exception:
-                return False, "Cannot read DOCX file"
-        
-        elif ext == "txt":
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    f.read(100)  # Try reading first 100 chars
-            except UnicodeDecodeError:
-                return False, "TXT file has invalid encoding (must be UTF-8)"
-            except Exception:
-                return False, "Cannot read TXT file"
-        
-        elif ext in ("png", "jpg", "jpeg", "tiff", "bmp"):
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False, "File is empty", None
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        with mm:
+            # One header block serves every format check below
+            header = mm[:HEADER_READ_SIZE]
+
+            if ext == "pdf":
+                if not header.startswith(b'%PDF'):
+                    return False, "Invalid PDF file (missing header)", None
+
+            elif ext == "docx":
+                if not header.startswith(b'PK\x03\x04'):  # ZIP header
+                    return False, "Invalid DOCX file (not a valid ZIP)", None
+
+            elif ext in ("png", "jpg", "jpeg", "tiff", "bmp"):
+                if sniff_image_type(header) != _IMAGE_EXT_ALIASES.get(ext, ext):
+                    return False, "Invalid or corrupted image file", None
+
+            elif ext == "txt":
+                try:
+                    # Incremental decode tolerates a multi-byte character cut at the boundary
+                    codecs.getincrementaldecoder('utf-8')().decode(header, final=False)
+                except UnicodeDecodeError:
+                    return False, "TXT file has invalid encoding (must be UTF-8)", None
+
+            h = hashlib.blake2b(digest_size=16)
+            h.update(salt.encode("utf-8"))
+            h.update(mm)
+            digest = h.hexdigest()
+
+        if verify_images_with_pil and ext in ("png", "jpg", "jpeg", "tiff", "bmp"):
             try:
                 from PIL import Image
                 with Image.open(file_path) as img:
                     img.verify()
             except ImportError:
-                return True, None  # PIL not installed, skip image validation
+                pass  # PIL not installed, skip image validation
             except Exception:
-                return False, "Invalid or corrupted image file"
+                return False, "Invalid or corrupted image file", None
         
-        return True, None
+        return True, None, digest
     except Exception as e:
-        return False, f"File validation error: {str(e)}"
+        return False, f"File validation error: {str(e)}", None
 
 
-def save_upload_file_temp(upload_file: UploadFile) -> str:
-    """Save an UploadFile to a temporary file and return the path."""
+async def save_upload_file_temp(upload_file: UploadFile, max_size_mb: Optional[int] = None) -> str:
+    """Stream an UploadFile to a temporary file in 1 MiB chunks and return the path.
+
+    Raises FileTooLargeError as soon as more than `max_size_mb` has been received.
+    """
     suffix = os.path.splitext(upload_file.filename)[1]
     fd, temp_path = tempfile.mkstemp(suffix=suffix, prefix="upload_")
     os.close(fd)
+    max_bytes = max_size_mb * 1024 * 1024 if max_size_mb else None
     try:
-        with open(temp_path, 'wb') as f:
-            shutil.copyfileobj(upload_file.file, f)
+        written = 0
+        async with aiofiles.open(temp_path, 'wb') as f:
+            while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if max_bytes is not None and written > max_bytes:
+                    raise FileTooLargeError(f"File too large. Max {max_size_mb} MB allowed")
+                await f.write(chunk)
     except Exception:
         try:
             os.remove(temp_path)
@@ -123,7 +183,15 @@ def validate_file_size(file_path: str, max_size_mb: int = 10) -> bool:
         return False
 
 
-def validate_mime_type(upload_file: UploadFile, allowed_mimes: List[str]) -> Tuple[bool, Optional[str]]:
+@lru_cache(maxsize=32)
+def _compile_mimes(allowed_mimes: Tuple[str, ...]) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """Split allowed MIME patterns into exact types and "type/" prefixes (from "type/*"), once per list."""
+    exact = frozenset(m.lower() for m in allowed_mimes if not m.endswith("/*"))
+    prefixes = tuple(m[:-1].lower() for m in allowed_mimes if m.endswith("/*"))
+    return exact, prefixes
+
+
+def validate_mime_type(upload_file: UploadFile, allowed_mimes: Sequence[str]) -> Tuple[bool, Optional[str]]:
     """Validate content_type (MIME) of an UploadFile.
 
     Returns (is_valid, error_message)
@@ -134,13 +202,9 @@ def validate_mime_type(upload_file: UploadFile, allowed_mimes: List[str]) -> Tup
             return False, "Missing content type"
 
         # allow simple startswith matching (image/*, application/pdf, text/plain, etc.)
-        for m in allowed_mimes:
-            if m.endswith("/*"):
-                if content_type.startswith(m.split('/')[0] + '/'):
-                    return True, None
-            else:
-                if content_type == m:
-                    return True, None
+        exact, prefixes = _compile_mimes(tuple(allowed_mimes))
+        if content_type in exact or content_type.startswith(prefixes):
+            return True, None
 
         return False, f"Unsupported MIME type: {content_type}"
     except Exception as e:
@@ -182,16 +246,23 @@ def setup_logger(
     log_level: str = "INFO",
     log_file: Optional[str] = None,
 ) -> logging.Logger:
-    """Configure and return logger instance with file rotation."""
+    """Configure and return logger instance with file rotation.
+
+    The logger only enqueues records; a background QueueListener thread
+    formats them and writes to the console and rotating file handlers.
+    Only the main process configures handlers: spawned pool workers re-import
+    main.py, and must not open their own handles on the shared log file.
+    """
     logger = logging.getLogger(name)
     
     # Avoid duplicate handlers
-    if logger.handlers:
+    if logger.handlers or multiprocessing.parent_process() is not None:
         return logger
     
     # Convert string level to logging level
     level = getattr(logging, log_level.upper(), logging.INFO)
     logger.setLevel(level)
+    handlers = []
     
     # Console handler
     console_handler = logging.StreamHandler()
@@ -203,9 +274,10 @@ def setup_logger(
         datefmt='%Y-%m-%d %H:%M:%S'  # FIXED: Changed from '%Y-%m-d' to '%Y-%m-%d'
     )
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler with rotation
+    file_error = None
     if log_file:
         try:
             log_dir = os.path.dirname(log_file)
@@ -219,17 +291,42 @@ def setup_logger(
             )
             file_handler.setLevel(level)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
         except Exception as e:
-            logger.warning(f"Could not set up file logging: {e}")
+            file_error = e
+    
+    # Non-blocking enqueue on the caller's thread; I/O happens on the listener thread
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _log_listeners.append((logger, queue_handler, listener))
+    
+    if file_error is not None:
+        logger.warning(f"Could not set up file logging: {file_error}")
     
     return logger
 
 
+def stop_log_listeners():
+    """Flush queued log records and stop all background log listeners.
+
+    Each logger then writes to its handlers directly, so records logged
+    after shutdown (e.g. by the server itself) are not lost.
+    """
+    while _log_listeners:
+        logger, queue_handler, listener = _log_listeners.pop()
+        listener.stop()
+        logger.removeHandler(queue_handler)
+        for handler in listener.handlers:
+            logger.addHandler(handler)
+
+
 def get_session_stats(sessions) -> dict:
     """Get session statistics for monitoring."""
-    all_sessions = sessions.get_all_sessions()
+    stats = sessions.get_session_stats()
     return {
-        "total_active": len(all_sessions),
-        "oldest_session_age_seconds": sessions.get_oldest_session_age(),
+        "total_active": stats["total_active"],
+        "oldest_session_age_seconds": stats["oldest_session_age_seconds"],
     }
\ No newline at end of file